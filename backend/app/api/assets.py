@@ -4,24 +4,133 @@ Paeon AI - Asset Generation API
 Endpoints for generating Fair Balance compliant patient education materials.
 """
 
+import asyncio
+import logging
+from collections.abc import AsyncIterator
 from datetime import datetime, timedelta, timezone
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import Response
+import orjson
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from redis.exceptions import RedisError
 
 from app.schemas import (
     AssetGenerationRequest,
     GeneratedAsset,
+    AssetBatchItem,
     AssetExportRequest,
     AssetExportResponse,
+    ASSET_BATCH_ITEM_LIST_ADAPTER,
 )
+from app.core.batching import AdaptiveBatcher
+from app.core.cache import LRUCache, get_json, set_json
+from app.core.config import settings
 from app.services.assets import fair_balance_engine
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/assets", tags=["Asset Generation"])
 
-# In-memory cache for generated assets (use Redis in production)
-_asset_cache: dict[str, dict] = {}
+# Maximum number of assets accepted by the bulk generation endpoint
+MAX_BATCH_REQUESTS = 64
+
+# Coalesces concurrent single-asset requests into shared generation passes
+_generation_batcher = AdaptiveBatcher(
+    fair_balance_engine.generate_patient_cards_batch,
+    max_batch_size=settings.asset_batch_max_size,
+    max_wait_ms=settings.asset_batch_max_wait_ms,
+)
+
+# The drug database is static, so the listing is serialized once at import
+_AVAILABLE_DRUGS = tuple(
+    {
+        "name": drug.title(),
+        "brand_names": info.get("brand_names", []),
+        "drug_class": info.get("drug_class", ""),
+    }
+    for drug, info in fair_balance_engine.DRUG_DATABASE.items()
+)
+_AVAILABLE_DRUGS_BYTES = orjson.dumps(_AVAILABLE_DRUGS)
+
+
+# Generated assets live in Redis so every worker can serve follow-up requests;
+# recently used cards are also kept in a bounded per-worker LRU, which is
+# all that's left to serve from while Redis is unreachable. Cards hold
+# metadata only; PDF/PNG bytes are rendered on export and never cached here.
+_local_cards = LRUCache(maxsize=settings.asset_local_cache_size)
+
+
+def _asset_key(asset_id: str) -> str:
+    """Redis key for a generated asset."""
+    return f"asset:{asset_id}"
+
+
+async def _store_card(card: dict) -> None:
+    """Persist a generated card in the shared cache."""
+    _local_cards.set(card["id"], card)
+    try:
+        await set_json(_asset_key(card["id"]), card, settings.asset_cache_ttl_seconds)
+    except RedisError:
+        logger.warning("Redis unavailable; asset %s cached in this worker only", card["id"])
+
+
+async def _load_card(asset_id: str) -> dict | None:
+    """Load a previously generated card, checking the local LRU first."""
+    card = _local_cards.get(asset_id)
+    if card is None:
+        try:
+            card = await get_json(_asset_key(asset_id))
+        except RedisError:
+            logger.warning("Redis unavailable; asset %s not found in this worker", asset_id)
+            return None
+        if card is not None:
+            _local_cards.set(asset_id, card)
+    return card
+
+
+def _to_generated_asset(card: dict) -> GeneratedAsset:
+    """Build the API response model for a generated card."""
+    return GeneratedAsset(
+        id=card["id"],
+        drug_name=card["drug_name"],
+        dosage=card.get("dosage"),
+        title=card["title"],
+        how_to_take=card["how_to_take"],
+        key_benefits=card["key_benefits"],
+        safety_information=card["safety_information"],
+        contraindications=card["contraindications"],
+        black_box_warning=card.get("black_box_warning"),
+        disclaimer=card["disclaimer"],
+        fair_balance_score=card["fair_balance_score"],
+        compliance_verified=card["compliance_verified"],
+        created_at=card["created_at"],
+    )
+
+
+def _generation_args(request: AssetGenerationRequest) -> dict:
+    """Keyword arguments for the card generator."""
+    return {
+        "drug_name": request.drug_name,
+        "dosage": request.dosage,
+        "indication": request.indication,
+        "include_black_box": request.include_black_box,
+    }
+
+
+async def _prime_stream(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Pull the first chunk eagerly so rendering errors are raised before
+    the response headers are sent.
+    """
+    first_chunk = await anext(chunks, b"")
+
+    async def _replay() -> AsyncIterator[bytes]:
+        yield first_chunk
+        async for chunk in chunks:
+            yield chunk
+
+    return _replay()
 
 
 @router.post(
@@ -46,33 +155,62 @@ _asset_cache: dict[str, dict] = {}
 async def generate_asset(request: AssetGenerationRequest) -> GeneratedAsset:
     """Generate a patient education asset."""
     try:
-        card = await fair_balance_engine.generate_patient_card(
-            drug_name=request.drug_name,
-            dosage=request.dosage,
-            indication=request.indication,
-            include_black_box=request.include_black_box,
-        )
+        card = await _generation_batcher.submit(_generation_args(request))
         
         # Cache the asset
-        _asset_cache[card["id"]] = card
+        await _store_card(card)
         
-        return GeneratedAsset(
-            id=UUID(card["id"]),
-            drug_name=card["drug_name"],
-            dosage=card.get("dosage"),
-            title=card["title"],
-            how_to_take=card["how_to_take"],
-            key_benefits=card["key_benefits"],
-            safety_information=card["safety_information"],
-            contraindications=card["contraindications"],
-            black_box_warning=card.get("black_box_warning"),
-            disclaimer=card["disclaimer"],
-            fair_balance_score=card["fair_balance_score"],
-            compliance_verified=card["compliance_verified"],
-            created_at=card["created_at"],
+        return _to_generated_asset(card)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Asset generation failed: {str(e)}")
+
+
+@router.post(
+    "/generate/batch",
+    response_model=None,
+    responses={200: {"model": list[AssetBatchItem]}},
+    summary="Generate patient education assets in bulk",
+    description=f"""
+    Generates Fair Balance compliant patient education cards for up to
+    {MAX_BATCH_REQUESTS} drugs in one request.
+    
+    Label lookups for drugs outside the curated database are shared across
+    the batch and run concurrently. Results are returned in request order,
+    each holding either the generated `asset` or the `error` for that item;
+    one failed drug does not fail the others.
+    """,
+)
+async def generate_assets_batch(requests: list[AssetGenerationRequest]) -> Response:
+    """Generate several patient education assets."""
+    if not requests or len(requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Batch must contain between 1 and {MAX_BATCH_REQUESTS} requests",
+        )
+    
+    try:
+        cards = await fair_balance_engine.generate_patient_cards_batch(
+            [_generation_args(request) for request in requests]
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Asset generation failed: {str(e)}")
+    
+    generated = [card for card in cards if not isinstance(card, Exception)]
+    await asyncio.gather(*(_store_card(card) for card in generated))
+    
+    results = [
+        AssetBatchItem(
+            drug_name=request.drug_name,
+            error=f"Asset generation failed: {card}",
+        )
+        if isinstance(card, Exception)
+        else AssetBatchItem(drug_name=request.drug_name, asset=_to_generated_asset(card))
+        for request, card in zip(requests, cards)
+    ]
+    return Response(
+        content=ASSET_BATCH_ITEM_LIST_ADAPTER.dump_json(results),
+        media_type="application/json",
+    )
 
 
 @router.get(
@@ -82,48 +220,42 @@ async def generate_asset(request: AssetGenerationRequest) -> GeneratedAsset:
 )
 async def get_asset(asset_id: UUID) -> GeneratedAsset:
     """Retrieve a previously generated asset."""
-    card = _asset_cache.get(str(asset_id))
+    card = await _load_card(str(asset_id))
     if not card:
         raise HTTPException(status_code=404, detail="Asset not found")
     
-    return GeneratedAsset(
-        id=UUID(card["id"]),
-        drug_name=card["drug_name"],
-        dosage=card.get("dosage"),
-        title=card["title"],
-        how_to_take=card["how_to_take"],
-        key_benefits=card["key_benefits"],
-        safety_information=card["safety_information"],
-        contraindications=card["contraindications"],
-        black_box_warning=card.get("black_box_warning"),
-        disclaimer=card["disclaimer"],
-        fair_balance_score=card["fair_balance_score"],
-        compliance_verified=card["compliance_verified"],
-        created_at=card["created_at"],
-    )
+    return _to_generated_asset(card)
 
 
 @router.post(
     "/export/pdf",
     summary="Export asset as PDF",
-    description="Export a patient education asset as a PDF document.",
+    description="""
+    Export a patient education asset as a PDF document.
+    
+    The file is streamed with chunked transfer encoding. Pass `chunked=0`
+    for clients that require a `Content-Length` header.
+    """,
 )
-async def export_pdf(request: AssetExportRequest) -> Response:
+async def export_pdf(
+    request: AssetExportRequest,
+    chunked: bool = Query(default=True, description="Stream the file in chunks"),
+) -> Response:
     """Export asset as PDF."""
-    card = _asset_cache.get(str(request.asset_id))
+    card = await _load_card(str(request.asset_id))
     if not card:
         raise HTTPException(status_code=404, detail="Asset not found")
     
+    headers = {
+        "Content-Disposition": f"attachment; filename=patient_card_{card['drug_name']}.pdf"
+    }
     try:
-        pdf_bytes = await fair_balance_engine.export_to_pdf(card)
+        if chunked:
+            chunks = await _prime_stream(fair_balance_engine.export_to_pdf_stream(card))
+            return StreamingResponse(chunks, media_type="application/pdf", headers=headers)
         
-        return Response(
-            content=pdf_bytes,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=patient_card_{card['drug_name']}.pdf"
-            },
-        )
+        pdf_bytes = await fair_balance_engine.export_to_pdf(card)
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PDF export failed: {str(e)}")
 
@@ -131,24 +263,32 @@ async def export_pdf(request: AssetExportRequest) -> Response:
 @router.post(
     "/export/png",
     summary="Export asset as PNG",
-    description="Export a patient education asset as a PNG image.",
+    description="""
+    Export a patient education asset as a PNG image.
+    
+    The file is streamed with chunked transfer encoding. Pass `chunked=0`
+    for clients that require a `Content-Length` header.
+    """,
 )
-async def export_png(request: AssetExportRequest) -> Response:
+async def export_png(
+    request: AssetExportRequest,
+    chunked: bool = Query(default=True, description="Stream the file in chunks"),
+) -> Response:
     """Export asset as PNG."""
-    card = _asset_cache.get(str(request.asset_id))
+    card = await _load_card(str(request.asset_id))
     if not card:
         raise HTTPException(status_code=404, detail="Asset not found")
     
+    headers = {
+        "Content-Disposition": f"attachment; filename=patient_card_{card['drug_name']}.png"
+    }
     try:
-        png_bytes = await fair_balance_engine.export_to_png(card)
+        if chunked:
+            chunks = await _prime_stream(fair_balance_engine.export_to_png_stream(card))
+            return StreamingResponse(chunks, media_type="image/png", headers=headers)
         
-        return Response(
-            content=png_bytes,
-            media_type="image/png",
-            headers={
-                "Content-Disposition": f"attachment; filename=patient_card_{card['drug_name']}.png"
-            },
-        )
+        png_bytes = await fair_balance_engine.export_to_png(card)
+        return Response(content=png_bytes, media_type="image/png", headers=headers)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"PNG export failed: {str(e)}")
 
@@ -166,7 +306,7 @@ async def quick_generate(drug_name: str, dosage: str = None) -> dict:
             dosage=dosage,
         )
         
-        _asset_cache[card["id"]] = card
+        await _store_card(card)
         
         return {
             "id": card["id"],
@@ -189,14 +329,20 @@ async def quick_generate(drug_name: str, dosage: str = None) -> dict:
     summary="Get list of drugs with detailed information",
     description="Returns list of drugs that have detailed information available.",
 )
-async def get_available_drugs() -> list[dict]:
+async def get_available_drugs() -> Response:
     """Get list of drugs with detailed information."""
-    drugs = list(fair_balance_engine.DRUG_DATABASE.keys())
-    return [
-        {
-            "name": drug.title(),
-            "brand_names": fair_balance_engine.DRUG_DATABASE[drug].get("brand_names", []),
-            "drug_class": fair_balance_engine.DRUG_DATABASE[drug].get("drug_class", ""),
-        }
-        for drug in drugs
-    ]
+    return Response(content=_AVAILABLE_DRUGS_BYTES, media_type="application/json")
+
+
+@router.get(
+    "/drugs/suggest",
+    response_model=list[str],
+    summary="Autocomplete drug names",
+    description="Returns up to `limit` curated drug, brand and generic names starting with `q`.",
+)
+async def suggest_drugs(
+    q: str = Query(..., min_length=1, max_length=100, description="Name prefix"),
+    limit: int = Query(default=10, ge=1, le=50),
+) -> list[str]:
+    """Suggest drug names for a prefix."""
+    return fair_balance_engine.suggest(q, limit)
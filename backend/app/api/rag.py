@@ -4,25 +4,80 @@ Paeon AI - RAG Intelligence API
 Endpoints for regulatory drug intelligence from FDA, DailyMed, PubMed.
 """
 
-from uuid import UUID
+import asyncio
+import base64
+import hashlib
+from datetime import datetime
 
+import orjson
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
 
 from app.schemas import (
     IntelligenceFeedResponse,
-    IntelligenceItem,
     IntelligenceSearchRequest,
     SourceVerificationResponse,
     SearchResponse,
 )
+from app.core.cache import get_bytes, set_bytes
+from app.core.config import cfg, settings
 from app.services.rag import rag_engine
 
 router = APIRouter(prefix="/rag", tags=["RAG Intelligence"])
 
 
+def _feed_cache_key(
+    cursor: str | None,
+    page_size: int,
+    types: list[str] | None,
+    severity: list[str] | None,
+) -> str:
+    """Redis key for a feed page; filters are order-insensitive."""
+    return (
+        f"rag:feed:{cursor or ''}:{page_size}:"
+        f"{','.join(sorted(types or []))}:{','.join(sorted(severity or []))}"
+    )
+
+
+def _encode_cursor(position: tuple[float, datetime, str]) -> str:
+    """Opaque URL-safe cursor for a feed position."""
+    priority, published_date, item_id = position
+    return base64.urlsafe_b64encode(
+        orjson.dumps([priority, published_date.isoformat(), item_id])
+    ).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[float, datetime, str]:
+    """Inverse of `_encode_cursor`; raises 400 on malformed input."""
+    try:
+        priority, published_date, item_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        published_date = datetime.fromisoformat(published_date)
+        # Feed dates are all UTC-aware; a naive one can't be compared to them
+        if published_date.tzinfo is None:
+            raise ValueError("naive cursor timestamp")
+        return float(priority), published_date, str(item_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid feed cursor")
+
+
+def _search_cache_key(request: IntelligenceSearchRequest) -> str:
+    """Redis key for a search, hashed since queries are free text."""
+    digest = hashlib.blake2b(
+        orjson.dumps([request.query, request.drug_name, request.limit]),
+        digest_size=16,
+    ).hexdigest()
+    return f"rag:search:{digest}"
+
+
+def _json_response(body: bytes) -> Response:
+    """Response for an already-serialized JSON body."""
+    return Response(content=body, media_type="application/json")
+
+
 @router.get(
     "/intel-feed",
-    response_model=IntelligenceFeedResponse,
+    response_model=None,
+    responses={200: {"model": IntelligenceFeedResponse}},
     summary="Get regulatory intelligence feed",
     description="""
     Returns aggregated regulatory intelligence from:
@@ -36,7 +91,7 @@ router = APIRouter(prefix="/rag", tags=["RAG Intelligence"])
     """,
 )
 async def get_intelligence_feed(
-    page: int = Query(default=1, ge=1, description="Page number"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
     page_size: int = Query(default=20, ge=1, le=100, description="Items per page"),
     types: list[str] | None = Query(
         default=None,
@@ -46,47 +101,61 @@ async def get_intelligence_feed(
         default=None,
         description="Filter by severity: high, medium, low, info",
     ),
-) -> IntelligenceFeedResponse:
+) -> Response:
     """Get paginated regulatory intelligence feed."""
+    cache_key = _feed_cache_key(cursor, page_size, types, severity)
+    cached = await get_bytes(cache_key)
+    if cached is not None:
+        return _json_response(cached)
+    
+    position = _decode_cursor(cursor) if cursor else None
+    
     try:
         result = await rag_engine.get_intelligence_feed(
-            page=page,
             page_size=page_size,
             types=types,
             severity=severity,
+            cursor=position,
         )
         
+        # Engine output is trusted; build the IntelligenceFeedResponse shape
+        # as plain dicts instead of validating one model per item
         items = [
-            IntelligenceItem(
-                id=UUID(item["id"]) if isinstance(item["id"], str) else item["id"],
-                type=item["type"],
-                severity=item["severity"],
-                title=item["title"],
-                drug_name=item["drug_name"],
-                summary=item["summary"],
-                source_name=item["source_name"],
-                source_url=item.get("source_url"),
-                published_date=item["published_date"],
-                is_verified=item["is_verified"],
-                verification_badge=item["source_name"] if item["is_verified"] else None,
-            )
+            {
+                "id": item["id"],
+                "type": item["type"],
+                "severity": item["severity"],
+                "title": item["title"],
+                "drug_name": item["drug_name"],
+                "summary": item["summary"],
+                "source_name": item["source_name"],
+                "source_url": item.get("source_url"),
+                "published_date": item["published_date"],
+                "is_verified": item["is_verified"],
+                "verification_badge": item["source_name"] if item["is_verified"] else None,
+            }
             for item in result["items"]
         ]
         
-        return IntelligenceFeedResponse(
-            items=items,
-            total=result["total"],
-            page=result["page"],
-            page_size=result["page_size"],
-            has_more=result["has_more"],
-        )
+        body = orjson.dumps({
+            "items": items,
+            "page_size": result["page_size"],
+            "has_more": result["has_more"],
+            "next_cursor": (
+                _encode_cursor(result["next_cursor"]) if result["next_cursor"] else None
+            ),
+        })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch feed: {str(e)}")
+    
+    await set_bytes(cache_key, body, cfg.feed_cache_ttl_seconds)
+    return _json_response(body)
 
 
 @router.post(
     "/search",
-    response_model=SearchResponse,
+    response_model=None,
+    responses={200: {"model": SearchResponse}},
     summary="Search drug intelligence",
     description="""
     Search regulatory intelligence database using hybrid search:
@@ -98,8 +167,13 @@ async def get_intelligence_feed(
 )
 async def search_intelligence(
     request: IntelligenceSearchRequest,
-) -> SearchResponse:
+) -> Response:
     """Search drug intelligence database and return a wrapped response."""
+    cache_key = _search_cache_key(request)
+    cached = await get_bytes(cache_key)
+    if cached is not None:
+        return _json_response(cached)
+
     try:
         results = await rag_engine.search_intelligence(
             query=request.query,
@@ -119,14 +193,21 @@ async def search_intelligence(
             for item in results
         ]
 
-        return SearchResponse(results=search_results, query=request.query, total=len(search_results))
+        # Results are already plain dicts in the SearchResponse shape
+        body = orjson.dumps(
+            {"results": search_results, "query": request.query, "total": len(search_results)}
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Search failed: {str(e)}")
 
+    await set_bytes(cache_key, body, cfg.search_cache_ttl_seconds)
+    return _json_response(body)
+
 
 @router.get(
     "/verify-source/{source_id}",
-    response_model=SourceVerificationResponse,
+    response_model=None,
+    responses={200: {"model": SourceVerificationResponse}},
     summary="Verify a source citation",
     description="""
     Verifies the authenticity of a source citation by:
@@ -138,11 +219,14 @@ async def search_intelligence(
 async def verify_source(
     source_id: str,
     source_name: str = Query(..., description="Name of the source (e.g., 'FDA MedWatch')"),
-) -> SourceVerificationResponse:
+) -> Response:
     """Verify a source citation."""
     try:
         result = await rag_engine.verify_source(source_id, source_name)
-        return SourceVerificationResponse(**result)
+        # Engine output is trusted, so skip validation and serialize directly
+        return _json_response(
+            SourceVerificationResponse.model_construct(**result).model_dump_json().encode()
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Verification failed: {str(e)}")
 
@@ -154,21 +238,24 @@ async def verify_source(
 )
 async def get_drug_info(drug_name: str) -> dict:
     """Get comprehensive drug information."""
-    try:
-        # Fetch from DailyMed
-        label = await rag_engine.fetch_drug_label(drug_name)
-        
-        # Fetch related intelligence
-        intelligence = await rag_engine.search_intelligence(
-            query=drug_name,
-            drug_name=drug_name,
-            limit=5,
-        )
-        
-        return {
-            "drug_name": drug_name,
-            "label": label,
-            "recent_intelligence": intelligence,
-        }
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+    # Label (DailyMed) and related intelligence are independent lookups;
+    # a source that fails or times out is just left empty
+    timeout = settings.upstream_timeout_seconds
+    label, intelligence = await asyncio.gather(
+        asyncio.wait_for(rag_engine.fetch_drug_label(drug_name), timeout),
+        asyncio.wait_for(
+            rag_engine.search_intelligence(
+                query=drug_name,
+                drug_name=drug_name,
+                limit=5,
+            ),
+            timeout,
+        ),
+        return_exceptions=True,
+    )
+    
+    return {
+        "drug_name": drug_name,
+        "label": None if isinstance(label, Exception) else label,
+        "recent_intelligence": [] if isinstance(intelligence, Exception) else intelligence,
+    }
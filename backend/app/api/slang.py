@@ -8,6 +8,7 @@ from datetime import datetime, timezone
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
 from pydantic import BaseModel
 
 from app.schemas import (
@@ -16,11 +17,19 @@ from app.schemas import (
     TranslationFeedbackRequest,
     SupportedLanguage,
     StandardCode,
+    SUPPORTED_LANGUAGE_LIST_ADAPTER,
 )
 from app.services.slang import slang_to_clinical_engine
 
 router = APIRouter(prefix="/slang", tags=["Slang-to-Clinical Translation"])
 
+# The language list is static, so it is validated and serialized once
+_LANGUAGES_BYTES = SUPPORTED_LANGUAGE_LIST_ADAPTER.dump_json(
+    SUPPORTED_LANGUAGE_LIST_ADAPTER.validate_python(
+        slang_to_clinical_engine.get_supported_languages()
+    )
+)
+
 
 @router.post(
     "/translate",
@@ -60,7 +69,7 @@ async def translate_to_clinical(
         )
         
         return TranslationResponse(
-            id=UUID(result["id"]),
+            id=result["id"],
             original_language=result["original_language"],
             raw_input=result["raw_input"],
             normalized_english=result["normalized_english"],
@@ -84,14 +93,14 @@ async def translate_to_clinical(
 
 @router.get(
     "/languages",
-    response_model=list[SupportedLanguage],
+    response_model=None,
+    responses={200: {"model": list[SupportedLanguage]}},
     summary="Get supported input languages",
     description="Returns list of all supported languages for patient input.",
 )
-async def get_supported_languages() -> list[SupportedLanguage]:
+async def get_supported_languages() -> Response:
     """Get list of supported input languages."""
-    languages = slang_to_clinical_engine.get_supported_languages()
-    return [SupportedLanguage(**lang) for lang in languages]
+    return Response(content=_LANGUAGES_BYTES, media_type="application/json")
 
 
 @router.post(
@@ -1,6 +1,6 @@
 """Core module exports."""
 
-from app.core.config import settings, get_settings
+from app.core.config import settings, get_settings, cfg
 from app.core.security import (
     verify_password,
     get_password_hash,
@@ -12,6 +12,7 @@ from app.core.security import (
 __all__ = [
     "settings",
     "get_settings",
+    "cfg",
     "verify_password",
     "get_password_hash",
     "create_access_token",
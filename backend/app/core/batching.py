@@ -0,0 +1,100 @@
+"""
+Paeon AI Backend - Request Micro-Batching
+
+Coalesces concurrent requests into small batches so an expensive
+pipeline runs once per batch instead of once per request.
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Generic, TypeVar
+
+ItemT = TypeVar("ItemT")
+ResultT = TypeVar("ResultT")
+
+
+class AdaptiveBatcher(Generic[ItemT, ResultT]):
+    """
+    Micro-batcher backed by an asyncio.Queue.
+
+    Submitted items are collected until `max_batch_size` items are queued
+    or `max_wait_ms` has passed since the first one arrived, then handed
+    to `handler` in a single call. The handler returns one result per
+    item, in order; an Exception in place of a result fails only that
+    item's caller.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[ItemT]], Awaitable[Sequence[ResultT | Exception]]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 20.0,
+    ):
+        """Initialize the batcher; the worker task starts on first submit."""
+        self._handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: asyncio.Queue[tuple[ItemT, asyncio.Future]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._inflight: set[asyncio.Task] = set()
+
+    async def submit(self, item: ItemT) -> ResultT:
+        """Queue an item and wait for its result."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._collect())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Stop collecting and wait for in-flight batches to finish."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        if self._inflight:
+            await asyncio.gather(*self._inflight, return_exceptions=True)
+
+    async def _collect(self) -> None:
+        """Group queued items into batches and dispatch them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch without blocking collection of the next batch
+            task = asyncio.create_task(self._dispatch(batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: list[tuple[ItemT, asyncio.Future]]) -> None:
+        """Run the handler and resolve each caller's future."""
+        try:
+            results = await self._handler([item for item, _ in batch])
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(RuntimeError("Batch handler returned no result for item"))
@@ -0,0 +1,132 @@
+"""
+Paeon AI Backend - Shared Cache
+
+Redis-backed storage shared by every worker process, so state written by
+one Uvicorn worker is visible to all the others.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+import orjson
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+_redis: Redis | None = None
+
+
+class LRUCache:
+    """
+    Bounded in-process cache with least-recently-used eviction.
+    
+    Used as a small per-worker layer in front of Redis; memory stays
+    capped at `maxsize` entries however long the process runs.
+    """
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value and mark it as recently used."""
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def discard(self, key: Hashable) -> None:
+        """Remove an entry if present."""
+        self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class TTLCache(LRUCache):
+    """LRU cache whose entries also expire `ttl` seconds after being set."""
+
+    _MISSING = object()
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60.0):
+        super().__init__(maxsize)
+        self.ttl = ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a live cached value, dropping it if it has expired."""
+        entry = super().get(key, self._MISSING)
+        if entry is self._MISSING:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value that expires after the cache TTL."""
+        super().set(key, (time.monotonic() + self.ttl, value))
+
+
+def get_redis() -> Redis:
+    """Return the shared Redis client, creating it on first use."""
+    global _redis
+    if _redis is None:
+        _redis = Redis.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+        )
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client and its connection pool."""
+    global _redis
+    if _redis is not None:
+        await _redis.close()
+        _redis = None
+
+
+async def get_json(key: str) -> Any | None:
+    """Fetch and decode a JSON value, or None if the key is missing."""
+    raw = await get_redis().get(key)
+    if raw is None:
+        return None
+    return orjson.loads(raw)
+
+
+async def set_json(key: str, value: Any, ttl: int) -> None:
+    """Encode a value as JSON and store it with a TTL in seconds."""
+    await get_redis().set(key, orjson.dumps(value), ex=ttl)
+
+
+async def get_bytes(key: str) -> bytes | None:
+    """
+    Fetch a raw cached value, or None on a miss.
+    
+    Used for response caching, so Redis errors are treated as a miss
+    rather than failing the request.
+    """
+    try:
+        return await get_redis().get(key)
+    except RedisError:
+        return None
+
+
+async def set_bytes(key: str, value: bytes, ttl: int) -> None:
+    """Store a raw value with a TTL in seconds, ignoring Redis errors."""
+    try:
+        await get_redis().set(key, value, ex=ttl)
+    except RedisError:
+        pass
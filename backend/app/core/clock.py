@@ -0,0 +1,32 @@
+"""
+Paeon AI Backend - Request Clock
+
+One UTC timestamp per request, shared by everything the request writes.
+"""
+
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+
+# Set by the request middleware; unset outside a request
+_request_now: ContextVar[datetime] = ContextVar("request_now")
+
+
+def start_request_clock() -> Token:
+    """Capture the current UTC time for the running request."""
+    return _request_now.set(datetime.now(timezone.utc))
+
+
+def reset_request_clock(token: Token) -> None:
+    """Drop the request timestamp set by `start_request_clock`."""
+    _request_now.reset(token)
+
+
+def utc_now() -> datetime:
+    """
+    The request's timestamp inside a request, else the current UTC time.
+
+    Audit rows and assets created while handling one request share the
+    same timestamp, which also keeps them easy to correlate.
+    """
+    now = _request_now.get(None)
+    return now if now is not None else datetime.now(timezone.utc)
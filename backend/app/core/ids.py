@@ -0,0 +1,66 @@
+"""
+Paeon AI Backend - Identifier Generation
+
+Time-ordered UUIDs for primary keys on append-heavy tables, and random
+UUIDs for everything else. Randomness is drawn from the OS in blocks
+rather than with one getrandom() call per id.
+"""
+
+import os
+import threading
+import time
+import uuid
+
+# Bytes of OS randomness fetched per refill (256 UUIDv4s)
+_POOL_SIZE = 4096
+
+_pool = b""
+_pool_pos = 0
+_pool_lock = threading.Lock()
+
+
+def _reset_pool() -> None:
+    """Discard pooled randomness; a forked worker must not reuse its parent's."""
+    global _pool, _pool_pos, _pool_lock
+    _pool = b""
+    _pool_pos = 0
+    _pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+
+def _random_bytes(n: int) -> bytes:
+    """n bytes from the OS CSPRNG, served from a pooled block."""
+    global _pool, _pool_pos
+    with _pool_lock:
+        if _pool_pos + n > len(_pool):
+            _pool = os.urandom(_POOL_SIZE)
+            _pool_pos = 0
+        start = _pool_pos
+        _pool_pos += n
+        return _pool[start:_pool_pos]
+
+
+def uuid4() -> uuid.UUID:
+    """Generate a random UUIDv4, equivalent to `uuid.uuid4()`."""
+    return uuid.UUID(bytes=_random_bytes(16), version=4)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Generate a UUIDv7 (RFC 9562).
+
+    The leading 48 bits are the Unix time in milliseconds, so ids created
+    later sort later and btree inserts land on the rightmost index page
+    instead of a random one. The remaining 74 bits are random.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(_random_bytes(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76                           # version
+    value |= ((rand >> 62) & 0xFFF) << 64        # rand_a (12 bits)
+    value |= 0b10 << 62                          # variant
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF        # rand_b (62 bits)
+    return uuid.UUID(int=value)
@@ -4,51 +4,83 @@ Paeon AI Backend - Security Utilities
 Handles authentication, authorization, and security-critical operations.
 """
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+import bcrypt
+import jwt
+from starlette.concurrency import run_in_threadpool
 
-from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.config import cfg
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Key for anonymized identifiers (BLAKE2b accepts keys up to 64 bytes)
+_anon_key = cfg.secret_key.encode()[:64]
 
+# Decoded JWT payloads, keyed by token digest. The short TTL keeps a busy
+# client from re-verifying the same token on every request; expiry is
+# still re-checked on each hit.
+_token_cache = TTLCache(maxsize=10_000, ttl=1.0)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a password against its hash.
+    
+    bcrypt is CPU-bound, so it runs in the threadpool to keep the event loop free.
+    """
+    return await run_in_threadpool(
+        bcrypt.checkpw, plain_password.encode(), hashed_password.encode()
+    )
 
 
-def get_password_hash(password: str) -> str:
-    """Generate password hash."""
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    """
+    Generate password hash.
+    
+    bcrypt is CPU-bound, so it runs in the threadpool to keep the event loop free.
+    """
+    hashed = await run_in_threadpool(
+        bcrypt.hashpw, password.encode(), bcrypt.gensalt(cfg.bcrypt_rounds)
+    )
+    return hashed.decode()
 
 
 def create_access_token(data: dict[str, Any], expires_delta: timedelta | None = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=settings.access_token_expire_minutes)
+        expires_delta or timedelta(minutes=cfg.access_token_expire_minutes)
     )
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
+    return jwt.encode(to_encode, cfg.secret_key, algorithm=cfg.algorithm)
 
 
 def decode_access_token(token: str) -> dict[str, Any] | None:
-    """Decode and validate JWT token."""
+    """
+    Decode and validate JWT token.
+    
+    Callers get their own copy of the payload, so mutating it can't
+    affect later verifications served from the cache.
+    """
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        if payload.get("exp", float("inf")) > time.time():
+            return dict(payload)
+        return None
+
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
-        return payload
-    except JWTError:
+        payload = jwt.decode(token, cfg.secret_key, algorithms=[cfg.algorithm])
+    except jwt.PyJWTError:
         return None
+    _token_cache.set(cache_key, payload)
+    return dict(payload)
 
 
 def generate_anonymous_id(original_id: str) -> str:
     """Generate anonymized identifier for audit logging."""
-    import hashlib
-    
-    # Create a salted hash that's consistent but not reversible
-    salted = f"{settings.secret_key}:{original_id}"
-    return hashlib.sha256(salted.encode()).hexdigest()[:16]
+    # Keyed hash that's consistent but not reversible; 8 bytes -> 16 hex chars
+    return hashlib.blake2b(original_id.encode(), key=_anon_key, digest_size=8).hexdigest()
@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Any
 
 from sqlalchemy import (
+    DDL,
     Boolean,
     Column,
     DateTime,
@@ -17,20 +18,47 @@ from sqlalchemy import (
     ForeignKey,
     Index,
     Integer,
-    JSON,
     String,
     Text,
+    event,
     func,
+    text,
 )
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+from app.core.ids import uuid7
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
     pass
 
 
+@event.listens_for(Base.metadata, "after_create")
+def _set_column_compression(target, connection, **kw) -> None:
+    """
+    Apply per-column TOAST compression after `create_all`.
+    
+    Columns opt in with `info={"pg_compression": "lz4"}`; large label and
+    intelligence text is read far more often than written, and lz4
+    decompresses several times faster than the default pglz.
+    Requires PostgreSQL 14+.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    preparer = connection.dialect.identifier_preparer
+    for table in kw.get("tables") or target.sorted_tables:
+        for column in table.columns:
+            method = column.info.get("pg_compression")
+            if method:
+                connection.execute(text(
+                    f"ALTER TABLE {preparer.format_table(table)} "
+                    f"ALTER COLUMN {preparer.format_column(column)} "
+                    f"SET COMPRESSION {preparer.quote(method)}"
+                ))
+
+
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps."""
     
@@ -84,7 +112,7 @@ class TranslationQuery(Base, TimestampMixin):
     __tablename__ = "translation_queries"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     user_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), index=True
@@ -92,7 +120,7 @@ class TranslationQuery(Base, TimestampMixin):
     
     # Input data (PII-stripped)
     raw_input: Mapped[str] = mapped_column(Text, nullable=False)
-    detected_language: Mapped[str] = mapped_column(String(50))
+    detected_language: Mapped[str] = mapped_column(String(5))  # ISO 639-1, or "zh-cn"
     normalized_english: Mapped[str] = mapped_column(Text)
     
     # Clinical output
@@ -101,7 +129,7 @@ class TranslationQuery(Base, TimestampMixin):
     rationale: Mapped[str] = mapped_column(Text)
     
     # Standard codes
-    standard_codes: Mapped[dict[str, Any]] = mapped_column(JSON, default=list)
+    standard_codes: Mapped[dict[str, Any]] = mapped_column(JSONB, default=list)
     
     # Clinician feedback
     clinician_approved: Mapped[bool | None] = mapped_column(Boolean)
@@ -118,6 +146,13 @@ class TranslationQuery(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_translation_queries_created_at", "created_at"),
         Index("ix_translation_queries_language", "detected_language"),
+        # Containment lookups: standard_codes @> '[{"code": "R00.2"}]'
+        Index(
+            "ix_translation_std_codes_gin",
+            "standard_codes",
+            postgresql_using="gin",
+            postgresql_ops={"standard_codes": "jsonb_path_ops"},
+        ),
     )
 
 
@@ -157,30 +192,36 @@ class ClinicalMapping(Base, TimestampMixin):
 # DRUG INTELLIGENCE MODELS
 # ============================================================================
 
+# Native PostgreSQL enums: 4 bytes per row instead of a varchar
+IntelType = Enum(
+    "recall", "safety_alert", "new_indication", "label_update",
+    name="intel_type_enum",
+)
+Severity = Enum("high", "medium", "low", "info", name="severity_enum")
+
+
 class DrugIntelligence(Base, TimestampMixin):
     """Regulatory intelligence about drugs from FDA, DailyMed, etc."""
     
     __tablename__ = "drug_intelligence"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     
     # Drug identification
     drug_name: Mapped[str] = mapped_column(String(500), nullable=False, index=True)
-    ndc_codes: Mapped[list[str]] = mapped_column(JSON, default=list)
+    ndc_codes: Mapped[list[str]] = mapped_column(JSONB, default=list)
     rxcui: Mapped[str | None] = mapped_column(String(50))
     
     # Intelligence type
-    intel_type: Mapped[str] = mapped_column(
-        String(50), nullable=False
-    )  # recall, safety_alert, new_indication, label_update
-    severity: Mapped[str] = mapped_column(String(20))  # high, medium, low, info
+    intel_type: Mapped[str] = mapped_column(IntelType, nullable=False)
+    severity: Mapped[str] = mapped_column(Severity)
     
     # Content
     title: Mapped[str] = mapped_column(String(500), nullable=False)
-    summary: Mapped[str] = mapped_column(Text, nullable=False)
-    full_content: Mapped[str | None] = mapped_column(Text)
+    summary: Mapped[str] = mapped_column(Text, nullable=False, info={"pg_compression": "lz4"})
+    full_content: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
     
     # Source verification
     source_name: Mapped[str] = mapped_column(String(100), nullable=False)
@@ -199,7 +240,16 @@ class DrugIntelligence(Base, TimestampMixin):
     __table_args__ = (
         Index("ix_drug_intelligence_drug_type", "drug_name", "intel_type"),
         Index("ix_drug_intelligence_published", "published_date"),
-        Index("ix_drug_intelligence_severity", "severity"),
+        # Feed query: filter by type/severity, newest first. The short
+        # display columns are included; summary is unbounded Text and a
+        # long one would push the index tuple past the btree size limit
+        Index(
+            "ix_drug_intel_feed",
+            "intel_type",
+            "severity",
+            text("published_date DESC"),
+            postgresql_include=["title", "drug_name", "source_name", "is_verified"],
+        ),
     )
 
 
@@ -209,7 +259,7 @@ class DrugLabel(Base, TimestampMixin):
     __tablename__ = "drug_labels"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     
     # Drug identification
@@ -220,17 +270,17 @@ class DrugLabel(Base, TimestampMixin):
     set_id: Mapped[str | None] = mapped_column(String(100), unique=True)
     
     # Label sections
-    indications: Mapped[str | None] = mapped_column(Text)
-    dosage_administration: Mapped[str | None] = mapped_column(Text)
-    contraindications: Mapped[str | None] = mapped_column(Text)
-    warnings_precautions: Mapped[str | None] = mapped_column(Text)
-    adverse_reactions: Mapped[str | None] = mapped_column(Text)
-    drug_interactions: Mapped[str | None] = mapped_column(Text)
-    black_box_warning: Mapped[str | None] = mapped_column(Text)
+    indications: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    dosage_administration: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    contraindications: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    warnings_precautions: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    adverse_reactions: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    drug_interactions: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
+    black_box_warning: Mapped[str | None] = mapped_column(Text, info={"pg_compression": "lz4"})
     
     # Structured data
-    dosage_forms: Mapped[list[str]] = mapped_column(JSON, default=list)
-    routes: Mapped[list[str]] = mapped_column(JSON, default=list)
+    dosage_forms: Mapped[list[str]] = mapped_column(JSONB, default=list)
+    routes: Mapped[list[str]] = mapped_column(JSONB, default=list)
     
     # Source
     source_url: Mapped[str | None] = mapped_column(String(1000))
@@ -251,7 +301,7 @@ class PatientAsset(Base, TimestampMixin):
     __tablename__ = "patient_assets"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     created_by: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id")
@@ -264,9 +314,9 @@ class PatientAsset(Base, TimestampMixin):
     # Structured content
     title: Mapped[str] = mapped_column(String(500), nullable=False)
     how_to_take: Mapped[str] = mapped_column(Text)
-    key_benefits: Mapped[list[str]] = mapped_column(JSON, default=list)
+    key_benefits: Mapped[list[str]] = mapped_column(JSONB, default=list)
     safety_information: Mapped[str] = mapped_column(Text)
-    contraindications: Mapped[list[str]] = mapped_column(JSON, default=list)
+    contraindications: Mapped[list[str]] = mapped_column(JSONB, default=list)
     black_box_warning: Mapped[str | None] = mapped_column(Text)
     disclaimer: Mapped[str] = mapped_column(Text)
     
@@ -299,14 +349,15 @@ class AuditLog(Base):
     __tablename__ = "audit_logs"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
+    # Partition key; PostgreSQL requires it in the primary key
     timestamp: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), server_default=func.now(), nullable=False
+        DateTime(timezone=True), primary_key=True, server_default=func.now()
     )
     
     # Actor (anonymized)
-    actor_id_hash: Mapped[str] = mapped_column(String(64), index=True)
+    actor_id_hash: Mapped[str] = mapped_column(String(64))
     actor_role: Mapped[str | None] = mapped_column(String(50))
     
     # Action
@@ -322,7 +373,7 @@ class AuditLog(Base):
     # Compliance flags
     pii_detected: Mapped[bool] = mapped_column(Boolean, default=False)
     pii_stripped: Mapped[bool] = mapped_column(Boolean, default=False)
-    safety_flags: Mapped[list[str]] = mapped_column(JSON, default=list)
+    safety_flags: Mapped[list[str]] = mapped_column(JSONB, default=list)
     
     # Request metadata
     ip_address_hash: Mapped[str | None] = mapped_column(String(64))
@@ -330,19 +381,45 @@ class AuditLog(Base):
     session_id: Mapped[str | None] = mapped_column(String(64))
 
     __table_args__ = (
-        Index("ix_audit_logs_timestamp", "timestamp"),
+        # Append-only timestamps correlate with physical order, so BRIN
+        # gives range scans at a fraction of a btree's size; created on
+        # the parent, it cascades to a local index on every partition
+        Index("ix_audit_logs_timestamp", "timestamp", postgresql_using="brin"),
         Index("ix_audit_logs_action", "action_type"),
-        Index("ix_audit_logs_actor", "actor_id_hash"),
+        # Filtered audit listings (actor, then action) ordered newest
+        # first read straight off this index; it also serves actor-only
+        # lookups as a prefix
+        Index(
+            "ix_audit_logs_actor_action_time",
+            "actor_id_hash",
+            "action_type",
+            text("timestamp DESC"),
+        ),
+        # Monthly range partitions: time-windowed queries prune to the
+        # matching months and retention drops whole partitions
+        {"postgresql_partition_by": "RANGE (timestamp)"},
     )
 
 
+# Catch-all partition so inserts succeed before monthly partitions
+# (e.g. managed by pg_partman) are attached
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS audit_logs_default "
+        "PARTITION OF audit_logs DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
 class PIIDetectionLog(Base):
     """Log of detected and stripped PII for compliance verification."""
     
     __tablename__ = "pii_detection_logs"
 
     id: Mapped[uuid.UUID] = mapped_column(
-        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+        UUID(as_uuid=True), primary_key=True, default=uuid7
     )
     timestamp: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -354,14 +431,14 @@ class PIIDetectionLog(Base):
     )
     
     # Detection details (no actual PII stored)
-    pii_types_detected: Mapped[list[str]] = mapped_column(JSON, default=list)
+    pii_types_detected: Mapped[list[str]] = mapped_column(JSONB, default=list)
     pii_count: Mapped[int] = mapped_column(Integer, default=0)
     original_length: Mapped[int] = mapped_column(Integer)
     stripped_length: Mapped[int] = mapped_column(Integer)
     
     # Verification
     detection_model_version: Mapped[str] = mapped_column(String(50))
-    confidence_scores: Mapped[dict[str, float]] = mapped_column(JSON, default=dict)
+    confidence_scores: Mapped[dict[str, float]] = mapped_column(JSONB, default=dict)
 
     __table_args__ = (
         Index("ix_pii_detection_timestamp", "timestamp"),
@@ -4,29 +4,90 @@ Paeon AI Backend - Database Session Management
 Async SQLAlchemy session factory with connection pooling.
 """
 
+import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
+import orjson
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool
 
 from app.core.config import settings
 
+if settings.environment == "test":
+    # One shared connection instead of connecting per test
+    _pool_options: dict = {"poolclass": StaticPool}
+else:
+    # Each worker gets its share of the connection budget, so all
+    # workers together stay within db_max_connections
+    _pool_options = {
+        "poolclass": AsyncAdaptedQueuePool,
+        "pool_size": max(
+            1,
+            min(32, 4 * (os.cpu_count() or 1), settings.db_max_connections // settings.worker_count()),
+        ),
+        "max_overflow": 0,
+        "pool_timeout": 5,
+        "pool_recycle": 1800,
+    }
+
 # Create async engine with connection pooling
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
-    # Use NullPool for testing
-    poolclass=NullPool if settings.environment == "test" else None,
+    isolation_level="READ COMMITTED",
+    # No SELECT 1 per checkout; dead connections surface via asyncpg's
+    # command timeout and are replaced by pool_recycle
+    pool_pre_ping=False,
+    connect_args={
+        "server_settings": {"jit": "off"},
+        "command_timeout": 10,
+        # Hot SELECTs (feed, audit list, mapping lookups) reuse
+        # server-side prepared statements instead of re-planning
+        "statement_cache_size": 1024,
+        "prepared_statement_cache_size": 1024,
+    },
+    # JSONB columns are encoded/decoded with orjson
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    **_pool_options,
 )
 
+# Set in Session.info once a session has written anything
+_HAS_WRITES = "has_writes"
+
+
+class TrackedSession(Session):
+    """Session that records whether it issued any writes."""
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_flush(session: Session, flush_context: UOWTransaction) -> None:
+    """Flushed ORM changes count as writes."""
+    session.info[_HAS_WRITES] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_write_statement(orm_execute_state: ORMExecuteState) -> None:
+    """Executed INSERT/UPDATE/DELETE statements count as writes."""
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[_HAS_WRITES] = True
+
+
+def _needs_commit(session: AsyncSession) -> bool:
+    """Whether the session has flushed, executed, or pending writes."""
+    return session.in_transaction() and bool(
+        session.info.get(_HAS_WRITES) or session.new or session.dirty or session.deleted
+    )
+
+
 # Session factory
 async_session_maker = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False,
@@ -38,7 +99,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            # Read-only sessions skip the COMMIT round-trip
+            if _needs_commit(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
@@ -52,7 +115,9 @@ async def get_db_context() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_maker() as session:
         try:
             yield session
-            await session.commit()
+            # Read-only sessions skip the COMMIT round-trip
+            if _needs_commit(session):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
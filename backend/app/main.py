@@ -4,16 +4,23 @@ Paeon AI Backend - Main Application
 Production-grade FastAPI application for the Clinical Intelligence System.
 """
 
+import time
 from contextlib import asynccontextmanager
-from datetime import datetime, timezone
 
 import structlog
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
 from app.api import api_router
+from app.core.cache import close_redis, get_redis
+from app.core.clock import reset_request_clock, start_request_clock
 from app.core.config import settings
+from app.services.compliance.audit import audit_service
+from app.services.compliance.audit_bulk import audit_bulk_writer
+from app.services.compliance.pii_stripper import shutdown_process_pool
+from app.services.slang.mapping_cache import clinical_mapping_cache
 
 # Configure structured logging
 structlog.configure(
@@ -48,6 +55,13 @@ async def lifespan(app: FastAPI):
         environment=settings.environment,
     )
     
+    # Shared cache used by all workers
+    get_redis()
+    await clinical_mapping_cache.warm()
+    
+    # Batched audit log writes
+    audit_bulk_writer.start()
+    
     yield
     
     # Shutdown
@@ -55,7 +69,12 @@ async def lifespan(app: FastAPI):
     
     # Close any open connections
     from app.services.rag import rag_engine
+    from app.services.slang import slang_to_clinical_engine
     await rag_engine.close()
+    await slang_to_clinical_engine.term_batcher.close()
+    await audit_bulk_writer.stop()
+    await close_redis()
+    shutdown_process_pool()
 
 
 # Create FastAPI application
@@ -107,6 +126,7 @@ All medical decisions must be made by qualified healthcare providers.
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -119,23 +139,49 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large JSON payloads (feed pages, drug labels); level 1 keeps
+# CPU cost low while still shrinking JSON several-fold
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=1)
+
+
+# Docs and health probes are polled constantly and not worth a log line
+_SKIP_LOG_PATHS = frozenset({
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    f"{settings.api_prefix}/health",
+})
 
-# Request logging middleware
+
+# Request logging middleware. It also fixes the request timestamp and
+# buffers the audit rows written by handlers, handing them to the bulk
+# writer once the response is ready, all stamped with the request's
+# single clock reading; one middleware hop serves both
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
-    """Log all requests with timing."""
-    start_time = datetime.now(timezone.utc)
+    """Log all requests with timing; collect audit rows and flush them once."""
+    path = request.url.path
+    if path in _SKIP_LOG_PATHS:
+        return await call_next(request)
+    
+    start_ns = time.monotonic_ns()
     
-    response = await call_next(request)
+    clock_token = start_request_clock()
+    audit_token = audit_service.start_buffer()
+    try:
+        response = await call_next(request)
+    finally:
+        await audit_service.flush_buffer(audit_token)
+        reset_request_clock(clock_token)
     
-    duration = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
+    duration_ms = (time.monotonic_ns() - start_ns) / 1e6
     
     logger.info(
         "Request processed",
         method=request.method,
-        path=request.url.path,
+        path=path,
         status_code=response.status_code,
-        duration_ms=round(duration, 2),
+        duration_ms=round(duration_ms, 2),
     )
     
     return response
@@ -152,7 +198,7 @@ async def global_exception_handler(request: Request, exc: Exception):
         method=request.method,
     )
     
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "InternalServerError",
@@ -180,5 +226,9 @@ if __name__ == "__main__":
         "app.main:app",
         host="0.0.0.0",
         port=8000,
+        loop=settings.asgi_loop,
+        http=settings.asgi_http,
+        # Reload mode runs a single process
+        workers=None if settings.debug else settings.worker_count(),
         reload=settings.debug,
     )
@@ -8,7 +8,10 @@ from datetime import datetime
 from typing import Any, Optional
 from uuid import UUID
 
-from pydantic import BaseModel, Field, ConfigDict
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+
+# Canonical uuid string; ids we generate are emitted as str, not UUID objects
+UUID_STR_PATTERN = r"^[0-9a-f-]{36}$"
 
 
 # ============================================================================
@@ -53,7 +56,7 @@ class TranslationRequest(BaseModel):
 class TranslationResponse(BaseModel):
     """Clinical translation result."""
     
-    id: UUID = Field(..., description="Unique translation ID")
+    id: str = Field(..., pattern=UUID_STR_PATTERN, description="Unique translation ID")
     original_language: str = Field(..., description="Detected source language")
     raw_input: str = Field(..., description="Original input (PII-stripped)")
     normalized_english: str = Field(..., description="English canonical form")
@@ -114,7 +117,7 @@ class SupportedLanguage(BaseModel):
 class IntelligenceItem(BaseModel):
     """A single regulatory intelligence item."""
     
-    id: UUID
+    id: str = Field(..., pattern=UUID_STR_PATTERN)
     type: str = Field(..., description="recall, safety_alert, new_indication, label_update")
     severity: str = Field(..., description="high, medium, low, info")
     title: str
@@ -146,13 +149,15 @@ class IntelligenceItem(BaseModel):
 
 
 class IntelligenceFeedResponse(BaseModel):
-    """Intelligence feed response with pagination."""
+    """Intelligence feed response with keyset pagination."""
     
     items: list[IntelligenceItem]
-    total: int
-    page: int
     page_size: int
     has_more: bool
+    next_cursor: str | None = Field(
+        default=None,
+        description="Opaque cursor for the next page; None on the last page",
+    )
 
 
 class IntelligenceSearchRequest(BaseModel):
@@ -236,7 +241,7 @@ class AssetGenerationRequest(BaseModel):
 class GeneratedAsset(BaseModel):
     """Generated patient education asset."""
     
-    id: UUID
+    id: str = Field(..., pattern=UUID_STR_PATTERN)
     drug_name: str
     dosage: Optional[str]
     title: str
@@ -251,6 +256,14 @@ class GeneratedAsset(BaseModel):
     created_at: datetime
 
 
+class AssetBatchItem(BaseModel):
+    """One entry of a bulk generation response: the asset or its error."""
+    
+    drug_name: str
+    asset: Optional[GeneratedAsset] = None
+    error: Optional[str] = None
+
+
 class AssetExportRequest(BaseModel):
     """Request to export an asset."""
     
@@ -325,3 +338,13 @@ class ErrorResponse(BaseModel):
     message: str
     details: Optional[dict[str, Any]] = None
     request_id: Optional[str] = None
+
+
+# ============================================================================
+# TYPE ADAPTERS
+# ============================================================================
+
+# Built once at import so list responses serialize straight through
+# pydantic-core instead of FastAPI's per-request response_model handling
+SUPPORTED_LANGUAGE_LIST_ADAPTER = TypeAdapter(list[SupportedLanguage])
+ASSET_BATCH_ITEM_LIST_ADAPTER = TypeAdapter(list[AssetBatchItem])
@@ -8,16 +8,86 @@ Generates compliant patient education materials that:
 4. Support PDF/PNG export
 """
 
+import asyncio
+import bisect
+import copy
+import hashlib
 import io
-from datetime import datetime, timezone
+import textwrap
+from collections.abc import AsyncIterator, Callable, Mapping
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
-from uuid import uuid4
 
+import orjson
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+from app.core.cache import get_bytes, set_bytes
+from app.core.clock import utc_now
 from app.core.config import settings
+from app.core.ids import uuid4
+from app.services.compliance.matching import count_words
 from app.services.compliance.safety_validator import SafetyValidator
 from app.services.rag.engine import rag_engine
 
 
+def _freeze_drug_database(database: dict[str, dict[str, Any]]) -> Mapping[str, Mapping[str, Any]]:
+    """
+    Read-only curated database: entries become MappingProxyType views with
+    tuples in place of lists, so cards can share them without copying.
+    
+    Each entry also gets word counts of the static card fields, matching
+    what `_build_card` puts on the card (first four benefits, all
+    contraindications, the black box warning).
+    """
+    frozen = {}
+    for key, info in database.items():
+        entry = {
+            field: tuple(value) if isinstance(value, list) else value
+            for field, value in info.items()
+        }
+        entry["_wc_benefits"] = count_words(*entry.get("key_benefits", ())[:4])
+        entry["_wc_contraindications"] = count_words(*entry.get("contraindications", ()))
+        entry["_wc_black_box"] = count_words(entry.get("black_box_warning") or "")
+        frozen[key] = MappingProxyType(entry)
+    return MappingProxyType(frozen)
+
+
+def _build_drug_index(database: Mapping[str, Mapping[str, Any]]) -> dict[str, Mapping[str, Any]]:
+    """
+    Map every casefolded database key, brand name and generic name to its
+    drug entry. Database keys take precedence, then earlier entries.
+    """
+    index = {key.casefold(): info for key, info in database.items()}
+    for info in database.values():
+        for brand in info.get("brand_names", []):
+            index.setdefault(brand.casefold(), info)
+        if info.get("generic_name"):
+            index.setdefault(info["generic_name"].casefold(), info)
+    return index
+
+
+def _build_suggestion_index(database: Mapping[str, Mapping[str, Any]]) -> tuple[list[str], list[str]]:
+    """
+    Sorted casefolded names (keys, brands, generics) for prefix search,
+    with the display form of each name at the same position.
+    """
+    names: dict[str, str] = {}
+    for key, info in database.items():
+        names.setdefault(key.casefold(), key.title())
+    for info in database.values():
+        for brand in info.get("brand_names", []):
+            names.setdefault(brand.casefold(), brand)
+        if info.get("generic_name"):
+            names.setdefault(info["generic_name"].casefold(), info["generic_name"])
+    keys = sorted(names)
+    return keys, [names[key] for key in keys]
+
+
 class FairBalanceEngine:
     """
     Fair Balance compliant asset generation engine.
@@ -43,8 +113,29 @@ class FairBalanceEngine:
         "Please refer to full prescribing information before prescribing."
     )
 
+    # Chunk size used when streaming exported files to the client
+    EXPORT_CHUNK_SIZE = 64 * 1024
+
+    # Card fields that affect rendered exports; id and created_at do not
+    EXPORT_CACHE_FIELDS = (
+        "drug_name",
+        "dosage",
+        "how_to_take",
+        "key_benefits",
+        "safety_information",
+        "black_box_warning",
+        "contraindications",
+        "disclaimer",
+        "compliance_verified",
+        "fair_balance_score",
+    )
+
+    # PNG export fonts, cached by size (see _get_font)
+    PNG_FONT_PATH = "/System/Library/Fonts/Helvetica.ttc"
+    _fonts: dict[int, Any] = {}
+
     # Drug database (curated for MVP, would be from RAG in production)
-    DRUG_DATABASE = {
+    DRUG_DATABASE = _freeze_drug_database({
         "metformin": {
             "brand_names": ["Glucophage", "Fortamet", "Riomet"],
             "generic_name": "Metformin Hydrochloride",
@@ -163,33 +254,97 @@ class FairBalanceEngine:
             ),
             "monitoring": "Regular assessments for bleeding, kidney function",
         },
-    }
+    })
+
+    # Case-insensitive lookup by key, brand or generic name
+    _DRUG_INDEX = _build_drug_index(DRUG_DATABASE)
+
+    # Sorted names for prefix autocomplete (see suggest)
+    _SUGGEST_KEYS, _SUGGEST_NAMES = _build_suggestion_index(DRUG_DATABASE)
 
     def __init__(self):
         """Initialize the Fair Balance engine."""
         self.safety_validator = SafetyValidator()
+        self._pdf_styles = self._build_pdf_styles()
+        
+        # Fixed disclaimer text is parsed into a Paragraph once; each
+        # render takes a shallow copy, which shares the parsed fragments
+        # but keeps its own layout state (renders run on worker threads)
+        self._static_paragraphs = {
+            text: Paragraph(text, self._pdf_styles['disclaimer'])
+            for text in (self.PATIENT_DISCLAIMER, self.HCP_DISCLAIMER)
+        }
 
-    def get_drug_info(self, drug_name: str) -> dict[str, Any] | None:
+    @staticmethod
+    def _build_pdf_styles() -> dict[str, ParagraphStyle]:
+        """Build the PDF paragraph styles once; they are read-only after this."""
+        styles = getSampleStyleSheet()
+        return {
+            'title': ParagraphStyle(
+                'CustomTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                textColor=colors.HexColor('#3B4D2B'),
+                spaceAfter=12,
+            ),
+            'heading': ParagraphStyle(
+                'CustomHeading',
+                parent=styles['Heading2'],
+                fontSize=12,
+                textColor=colors.HexColor('#606C38'),
+                spaceBefore=12,
+                spaceAfter=6,
+            ),
+            'body': ParagraphStyle(
+                'CustomBody',
+                parent=styles['Normal'],
+                fontSize=10,
+                leading=14,
+            ),
+            'warning': ParagraphStyle(
+                'Warning',
+                parent=styles['Normal'],
+                fontSize=10,
+                textColor=colors.HexColor('#BC6C25'),
+                borderColor=colors.HexColor('#BC6C25'),
+                borderPadding=8,
+                borderWidth=1,
+            ),
+            'disclaimer': ParagraphStyle(
+                'Disclaimer',
+                parent=styles['Normal'],
+                fontSize=8,
+                textColor=colors.gray,
+                spaceBefore=20,
+            ),
+        }
+
+    def get_drug_info(self, drug_name: str) -> Mapping[str, Any] | None:
         """
         Retrieve drug information from database.
         
         In production, this would query RAG system.
         """
-        drug_key = drug_name.lower().strip()
-        
-        # Check exact match
-        if drug_key in self.DRUG_DATABASE:
-            return self.DRUG_DATABASE[drug_key]
-        
-        # Check brand names
-        for key, info in self.DRUG_DATABASE.items():
-            brand_names_lower = [b.lower() for b in info.get("brand_names", [])]
-            if drug_key in brand_names_lower:
-                return info
-            if info.get("generic_name", "").lower() == drug_key:
-                return info
+        return self._DRUG_INDEX.get(drug_name.casefold().strip())
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Drug names starting with prefix (case-insensitive), for autocomplete.
         
-        return None
+        Binary search over the sorted name list, so the cost is
+        O(log n + limit) rather than a scan of the database.
+        """
+        prefix = prefix.casefold().strip()
+        if not prefix:
+            return []
+        
+        start = bisect.bisect_left(self._SUGGEST_KEYS, prefix)
+        suggestions = []
+        for key, name in zip(self._SUGGEST_KEYS[start:start + limit], self._SUGGEST_NAMES[start:start + limit]):
+            if not key.startswith(prefix):
+                break
+            suggestions.append(name)
+        return suggestions
 
     async def generate_patient_card(
         self,
@@ -206,13 +361,74 @@ class FairBalanceEngine:
         if not drug_info:
             # Try to fetch from RAG
             label = await rag_engine.fetch_drug_label(drug_name)
-            if label:
-                drug_info = self._convert_label_to_card_format(label)
-            else:
-                # Return generic card
-                drug_info = self._generate_generic_drug_info(drug_name)
+            drug_info = self._resolve_uncurated_drug_info(drug_name, label)
         
-        # Build the card
+        return self._build_card(drug_name, drug_info, dosage, include_black_box)
+
+    async def generate_patient_cards_batch(
+        self,
+        requests: list[dict[str, Any]],
+    ) -> list[dict[str, Any] | Exception]:
+        """
+        Generate several patient cards in one pass.
+        
+        Each request holds the keyword arguments of `generate_patient_card`.
+        Label lookups for drugs missing from the curated database are issued
+        once per unique drug name and run concurrently. Results are returned
+        in request order; a failed item is returned as its exception.
+        """
+        uncurated = list({
+            request["drug_name"]
+            for request in requests
+            if not self.get_drug_info(request["drug_name"])
+        })
+        labels = await asyncio.gather(
+            *(rag_engine.fetch_drug_label(name) for name in uncurated),
+            return_exceptions=True,
+        )
+        label_by_drug = dict(zip(uncurated, labels))
+        
+        cards: list[dict[str, Any] | Exception] = []
+        for request in requests:
+            drug_name = request["drug_name"]
+            drug_info = self.get_drug_info(drug_name)
+            try:
+                if not drug_info:
+                    label = label_by_drug[drug_name]
+                    if isinstance(label, Exception):
+                        raise label
+                    drug_info = self._resolve_uncurated_drug_info(drug_name, label)
+                
+                cards.append(self._build_card(
+                    drug_name,
+                    drug_info,
+                    request.get("dosage"),
+                    request.get("include_black_box", True),
+                ))
+            except Exception as e:
+                cards.append(e)
+        
+        return cards
+
+    def _resolve_uncurated_drug_info(
+        self,
+        drug_name: str,
+        label: dict[str, Any] | None,
+    ) -> dict[str, Any]:
+        """Build card data from a DailyMed label, or a generic card if none."""
+        if label:
+            return self._convert_label_to_card_format(label)
+        # Return generic card
+        return self._generate_generic_drug_info(drug_name)
+
+    def _build_card(
+        self,
+        drug_name: str,
+        drug_info: Mapping[str, Any],
+        dosage: str | None,
+        include_black_box: bool,
+    ) -> dict[str, Any]:
+        """Assemble a card from drug data and score it for Fair Balance."""
         card = {
             "id": str(uuid4()),
             "drug_name": drug_info.get("brand_names", [drug_name])[0] if drug_info.get("brand_names") else drug_name,
@@ -225,18 +441,18 @@ class FairBalanceEngine:
             "contraindications": drug_info.get("contraindications", []),
             "black_box_warning": drug_info.get("black_box_warning") if include_black_box else None,
             "disclaimer": self.PATIENT_DISCLAIMER,
-            "created_at": datetime.now(timezone.utc),
+            "created_at": utc_now(),
         }
         
         # Calculate Fair Balance score
-        fair_balance = self._calculate_fair_balance_score(card)
+        fair_balance = self._calculate_fair_balance_score(card, drug_info)
         card["fair_balance_score"] = fair_balance["score"]
         card["compliance_verified"] = fair_balance["is_compliant"]
         card["compliance_notes"] = fair_balance.get("notes")
         
         return card
 
-    def _format_safety_info(self, drug_info: dict[str, Any]) -> str:
+    def _format_safety_info(self, drug_info: Mapping[str, Any]) -> str:
         """Format safety information for display."""
         parts = []
         
@@ -257,7 +473,11 @@ class FairBalanceEngine:
         
         return " ".join(parts) if parts else "Consult prescribing information for safety details."
 
-    def _calculate_fair_balance_score(self, card: dict[str, Any]) -> dict[str, Any]:
+    def _calculate_fair_balance_score(
+        self,
+        card: dict[str, Any],
+        drug_info: Mapping[str, Any] | None = None,
+    ) -> dict[str, Any]:
         """
         Calculate Fair Balance compliance score.
         
@@ -265,20 +485,50 @@ class FairBalanceEngine:
         - Benefits and risks must be roughly equal in prominence
         - Black box warning must be present if applicable
         - Disclaimer must be present
-        """
-        benefits = card.get("key_benefits", [])
-        safety_info = card.get("safety_information", "")
-        contraindications = card.get("contraindications", [])
-        black_box = card.get("black_box_warning")
-        disclaimer = card.get("disclaimer")
         
+        For curated drugs (`drug_info` with precomputed word counts) only
+        the formatted safety text is counted per card.
+        """
+        if drug_info is not None and "_wc_benefits" in drug_info:
+            risk_words = (
+                count_words(card.get("safety_information", ""))
+                + drug_info["_wc_contraindications"]
+                + (drug_info["_wc_black_box"] if card.get("black_box_warning") else 0)
+            )
+            return self._score_counts(drug_info["_wc_benefits"], risk_words, card.get("disclaimer"))
+        
+        # Cards for the same drug repeat the same text, so scores are cached
+        # on the scored fields; copy so callers can't mutate the cached dict
+        return dict(self._score_core(
+            tuple(card.get("key_benefits", [])),
+            card.get("safety_information", ""),
+            tuple(card.get("contraindications", [])),
+            card.get("black_box_warning"),
+            card.get("disclaimer"),
+        ))
+
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _score_core(
+        benefits: tuple[str, ...],
+        safety_info: str,
+        contraindications: tuple[str, ...],
+        black_box: str | None,
+        disclaimer: str | None,
+    ) -> dict[str, Any]:
+        """Pure Fair Balance scoring over hashable card fields."""
         # Calculate word counts
-        benefit_words = sum(len(b.split()) for b in benefits)
-        risk_words = len(safety_info.split()) + sum(len(c.split()) for c in contraindications)
+        benefit_words = count_words(*benefits)
+        risk_words = count_words(safety_info, *contraindications)
         
         if black_box:
-            risk_words += len(black_box.split())
+            risk_words += count_words(black_box)
         
+        return FairBalanceEngine._score_counts(benefit_words, risk_words, disclaimer)
+
+    @staticmethod
+    def _score_counts(benefit_words: int, risk_words: int, disclaimer: str | None) -> dict[str, Any]:
+        """Fair Balance score from benefit and risk word counts."""
         # Fair Balance ratio (risks should be at least 70% of benefits)
         balance_ratio = risk_words / max(benefit_words, 1)
         
@@ -353,55 +603,58 @@ class FairBalanceEngine:
         """
         Export patient card to PDF.
         
-        Uses ReportLab for PDF generation.
+        Uses ReportLab for PDF generation; output is cached by card content.
+        """
+        return await self._cached_export("pdf", card, self._render_pdf)
+
+    async def export_to_png(self, card: dict[str, Any]) -> bytes:
+        """
+        Export patient card to PNG.
+        
+        Uses Pillow for image generation; output is cached by card content.
+        """
+        return await self._cached_export("png", card, self._render_png)
+
+    async def _cached_export(
+        self,
+        kind: str,
+        card: dict[str, Any],
+        render: Callable[[dict[str, Any]], bytes],
+    ) -> bytes:
         """
-        from reportlab.lib import colors
-        from reportlab.lib.pagesizes import letter
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+        Return rendered output for a card, rendering only on a cache miss.
         
+        Cards for the same drug and dosage render to identical bytes, so
+        the output is cached in Redis under a hash of the rendered fields.
+        """
+        digest = hashlib.blake2b(
+            orjson.dumps(
+                {field: card.get(field) for field in self.EXPORT_CACHE_FIELDS},
+                option=orjson.OPT_SORT_KEYS,
+            ),
+            digest_size=16,
+        ).hexdigest()
+        key = f"export:{kind}:{digest}"
+        
+        cached = await get_bytes(key)
+        if cached is not None:
+            return cached
+        
+        # ReportLab and Pillow are blocking; keep them off the event loop
+        data = await asyncio.to_thread(render, card)
+        await set_bytes(key, data, settings.export_cache_ttl_seconds)
+        return data
+
+    def _render_pdf(self, card: dict[str, Any]) -> bytes:
+        """Render a patient card to PDF bytes."""
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
         
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#3B4D2B'),
-            spaceAfter=12,
-        )
-        heading_style = ParagraphStyle(
-            'CustomHeading',
-            parent=styles['Heading2'],
-            fontSize=12,
-            textColor=colors.HexColor('#606C38'),
-            spaceBefore=12,
-            spaceAfter=6,
-        )
-        body_style = ParagraphStyle(
-            'CustomBody',
-            parent=styles['Normal'],
-            fontSize=10,
-            leading=14,
-        )
-        warning_style = ParagraphStyle(
-            'Warning',
-            parent=styles['Normal'],
-            fontSize=10,
-            textColor=colors.HexColor('#BC6C25'),
-            borderColor=colors.HexColor('#BC6C25'),
-            borderPadding=8,
-            borderWidth=1,
-        )
-        disclaimer_style = ParagraphStyle(
-            'Disclaimer',
-            parent=styles['Normal'],
-            fontSize=8,
-            textColor=colors.gray,
-            spaceBefore=20,
-        )
+        title_style = self._pdf_styles['title']
+        heading_style = self._pdf_styles['heading']
+        body_style = self._pdf_styles['body']
+        warning_style = self._pdf_styles['warning']
+        disclaimer_style = self._pdf_styles['disclaimer']
         
         story = []
         
@@ -438,7 +691,12 @@ class FairBalanceEngine:
         
         # Disclaimer
         story.append(Spacer(1, 24))
-        story.append(Paragraph(card.get('disclaimer', self.PATIENT_DISCLAIMER), disclaimer_style))
+        disclaimer = card.get('disclaimer', self.PATIENT_DISCLAIMER)
+        static_disclaimer = self._static_paragraphs.get(disclaimer)
+        if static_disclaimer is not None:
+            story.append(copy.copy(static_disclaimer))
+        else:
+            story.append(Paragraph(disclaimer, disclaimer_style))
         
         # Compliance badge
         if card.get('compliance_verified'):
@@ -451,30 +709,37 @@ class FairBalanceEngine:
         doc.build(story)
         return buffer.getvalue()
 
-    async def export_to_png(self, card: dict[str, Any]) -> bytes:
+    @classmethod
+    def _get_font(cls, size: int) -> Any:
         """
-        Export patient card to PNG.
+        Font for PNG export at a given size, loaded once per size.
         
-        Uses Pillow for image generation.
+        Uses Helvetica where available, else Pillow's default font
+        (production would use custom fonts).
         """
-        from PIL import Image, ImageDraw, ImageFont
+        font = cls._fonts.get(size)
+        if font is None:
+            from PIL import ImageFont
+            try:
+                font = ImageFont.truetype(cls.PNG_FONT_PATH, size)
+            except OSError:
+                font = ImageFont.load_default()
+            cls._fonts[size] = font
+        return font
+
+    def _render_png(self, card: dict[str, Any]) -> bytes:
+        """Render a patient card to PNG bytes."""
+        from PIL import Image, ImageDraw
         
         # Create image
         width, height = 400, 600
         img = Image.new('RGB', (width, height), color='white')
         draw = ImageDraw.Draw(img)
         
-        # Use default font (production would use custom fonts)
-        try:
-            font_title = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 20)
-            font_heading = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 14)
-            font_body = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 11)
-            font_small = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", 9)
-        except OSError:
-            font_title = ImageFont.load_default()
-            font_heading = ImageFont.load_default()
-            font_body = ImageFont.load_default()
-            font_small = ImageFont.load_default()
+        font_title = self._get_font(20)
+        font_heading = self._get_font(14)
+        font_body = self._get_font(11)
+        font_small = self._get_font(9)
         
         # Colors
         primary = '#3B4D2B'
@@ -513,19 +778,17 @@ class FairBalanceEngine:
         if card.get('black_box_warning'):
             draw.rectangle([(15, y), (width-15, y+80)], outline=warning, width=2)
             draw.text((20, y+5), "⚠️ IMPORTANT SAFETY INFO", fill=warning, font=font_heading)
-            warning_text = card['black_box_warning'][:150] + "..."
-            # Word wrap (simplified)
-            draw.text((20, y+25), warning_text[:60], fill='black', font=font_small)
-            draw.text((20, y+38), warning_text[60:120], fill='black', font=font_small)
+            # Word wrap to the box: four lines of small text
+            warning_lines = textwrap.wrap(card['black_box_warning'], width=60, max_lines=4, placeholder="...")
+            draw.multiline_text((20, y+25), "\n".join(warning_lines), fill='black', font=font_small, spacing=2)
             y += 90
         
         # Disclaimer
         y = height - 60
         draw.line([(20, y), (width-20, y)], fill='lightgray')
         y += 10
-        disclaimer = card.get('disclaimer', '')[:100]
-        draw.text((20, y), disclaimer[:70], fill='gray', font=font_small)
-        draw.text((20, y+12), disclaimer[70:140], fill='gray', font=font_small)
+        disclaimer_lines = textwrap.wrap(card.get('disclaimer', ''), width=70, max_lines=2, placeholder="...")
+        draw.multiline_text((20, y), "\n".join(disclaimer_lines), fill='gray', font=font_small, spacing=1)
         
         # Compliance badge
         if card.get('compliance_verified'):
@@ -537,6 +800,33 @@ class FairBalanceEngine:
         img.save(buffer, format='PNG')
         return buffer.getvalue()
 
+    async def export_to_pdf_stream(self, card: dict[str, Any]) -> AsyncIterator[bytes]:
+        """
+        Export patient card to PDF as a stream of chunks.
+        
+        The document is rendered before the first chunk is yielded, so
+        rendering errors surface on the first iteration.
+        """
+        pdf_bytes = await self.export_to_pdf(card)
+        async for chunk in self._iter_chunks(pdf_bytes):
+            yield chunk
+
+    async def export_to_png_stream(self, card: dict[str, Any]) -> AsyncIterator[bytes]:
+        """
+        Export patient card to PNG as a stream of chunks.
+        
+        The image is rendered before the first chunk is yielded, so
+        rendering errors surface on the first iteration.
+        """
+        png_bytes = await self.export_to_png(card)
+        async for chunk in self._iter_chunks(png_bytes):
+            yield chunk
+
+    async def _iter_chunks(self, data: bytes) -> AsyncIterator[bytes]:
+        """Split rendered output into transfer-sized chunks."""
+        for start in range(0, len(data), self.EXPORT_CHUNK_SIZE):
+            yield data[start:start + self.EXPORT_CHUNK_SIZE]
+
 
 # Singleton instance
 fair_balance_engine = FairBalanceEngine()
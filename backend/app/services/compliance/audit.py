@@ -6,14 +6,47 @@ All operations are logged with anonymized identifiers.
 """
 
 import hashlib
-from datetime import datetime, timezone
+from contextvars import ContextVar, Token
+from datetime import datetime
 from typing import Any
-from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.clock import utc_now
+from app.core.config import cfg
+from app.core.ids import uuid7
 from app.core.security import generate_anonymous_id
 from app.db.models import AuditLog
+from app.services.compliance.audit_bulk import audit_bulk_writer, full_row
+
+# Columns exposed by AuditLogEntry; listing pages select only these
+# instead of whole rows (hashes, user agent, IP hash, ...)
+_ENTRY_COLUMNS = (
+    AuditLog.id,
+    AuditLog.timestamp,
+    AuditLog.action_type,
+    AuditLog.resource_type,
+    AuditLog.resource_id,
+    AuditLog.actor_id_hash,
+    AuditLog.confidence_score,
+    AuditLog.safety_flags,
+)
+
+
+# Encoded once; BLAKE2b keys are at most 64 bytes
+_audit_key = cfg.audit_salt.encode()[:64]
+
+# The same client IP and user agent show up on every audit row of a
+# request and across a user's session; their hashes are cached
+_ip_hashes = TTLCache(maxsize=10_000, ttl=3600.0)
+_user_agent_hashes = TTLCache(maxsize=10_000, ttl=3600.0)
+
+# Core table insert: audit rows are write-only, so skip the ORM entirely
+_AUDIT_INSERT = AuditLog.__table__.insert()
+
+# Request-scoped buffer of pending audit rows; None outside a buffered request
+_log_buffer: ContextVar[list[dict[str, Any]] | None] = ContextVar("audit_log_buffer", default=None)
 
 
 class AuditService:
@@ -22,23 +55,127 @@ class AuditService:
     
     Logs all operations for regulatory review while
     maintaining user privacy through anonymization.
+    
+    Audit rows are written best-effort, outside the caller's
+    transaction: the `log_*` methods hand each row to the background bulk
+    writer, or, inside a request started with `start_buffer`, collect it
+    until `flush_buffer` writes the whole request's rows at once.
     """
 
+    log_buffer = _log_buffer
+
     @staticmethod
     def hash_content(content: str) -> str:
-        """Generate SHA-256 hash of content for audit purposes."""
-        return hashlib.sha256(content.encode()).hexdigest()
+        """Generate a 256-bit BLAKE2b hash of content for audit purposes."""
+        return hashlib.blake2b(content.encode(), digest_size=32).hexdigest()
 
     @staticmethod
-    def hash_ip(ip_address: str | None, salt: str) -> str | None:
-        """Hash IP address for privacy."""
+    def hash_ip(ip_address: str | None) -> str | None:
+        """Hash IP address for privacy, keyed with the configured audit salt."""
         if not ip_address:
             return None
-        return hashlib.sha256(f"{salt}:{ip_address}".encode()).hexdigest()[:32]
+        digest = _ip_hashes.get(ip_address)
+        if digest is None:
+            digest = hashlib.blake2b(ip_address.encode(), key=_audit_key, digest_size=16).hexdigest()
+            _ip_hashes.set(ip_address, digest)
+        return digest
+
+    def _write(self, values: dict[str, Any]) -> dict[str, Any]:
+        """
+        Buffer one audit row, or queue it for the bulk writer.
+        
+        Every column, including the UUIDv7 id and timestamp, is set
+        client-side, so there is nothing to read back. Returns the row
+        values.
+        """
+        buffer = self.log_buffer.get()
+        if buffer is not None:
+            buffer.append(values)
+        else:
+            audit_bulk_writer.enqueue(values)
+        return values
+
+    def start_buffer(self) -> Token:
+        """Start buffering `log_*` rows for the current request."""
+        return self.log_buffer.set([])
+
+    async def flush_buffer(self, token: Token, db: AsyncSession | None = None) -> int:
+        """
+        End the buffer started by `start_buffer` and write its rows.
+        
+        With a session, the rows are inserted in one executemany on it
+        (committed with the caller's transaction), expanded to the full
+        column set so rows from different `log_*` helpers can share the
+        statement; without one they are handed to the background bulk
+        writer. Returns the row count.
+        """
+        entries = self.log_buffer.get() or []
+        self.log_buffer.reset(token)
+        if not entries:
+            return 0
+        
+        if db is not None:
+            await db.execute(_AUDIT_INSERT, [full_row(entry) for entry in entries])
+        else:
+            for entry in entries:
+                audit_bulk_writer.enqueue(entry)
+        return len(entries)
+
+    @staticmethod
+    def hash_user_agent(user_agent: str | None) -> str | None:
+        """Hash a user agent string to a 128-bit BLAKE2b digest."""
+        if not user_agent:
+            return None
+        digest = _user_agent_hashes.get(user_agent)
+        if digest is None:
+            digest = hashlib.blake2b(user_agent.encode(), digest_size=16).hexdigest()
+            _user_agent_hashes.set(user_agent, digest)
+        return digest
 
-    async def log_translation(
+    def log(
+        self,
+        action_type: str,
+        resource_type: str,
+        user_id: str | None = None,
+        actor_role: str = "clinician",
+        resource_id: str | None = None,
+        input_text: str | None = None,
+        output_text: str | None = None,
+        confidence: float | None = None,
+        pii_detected: bool = False,
+        pii_stripped: bool = False,
+        safety_flags: list[str] | None = None,
+        session_id: str | None = None,
+        ip_address: str | None = None,
+        user_agent: str | None = None,
+    ) -> None:
+        """
+        Queue an audit entry for the bulk writer.
+        
+        Unlike the `log_*` methods this bypasses any request buffer; the
+        entry is written with the next batch (within about a second).
+        """
+        audit_bulk_writer.enqueue({
+            "id": uuid7(),
+            "timestamp": utc_now(),
+            "actor_id_hash": generate_anonymous_id(user_id) if user_id else "anonymous",
+            "actor_role": actor_role,
+            "action_type": action_type,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "input_hash": self.hash_content(input_text) if input_text is not None else None,
+            "output_hash": self.hash_content(output_text) if output_text is not None else None,
+            "confidence_score": confidence,
+            "pii_detected": pii_detected,
+            "pii_stripped": pii_stripped,
+            "safety_flags": safety_flags or [],
+            "ip_address_hash": self.hash_ip(ip_address),
+            "user_agent_hash": self.hash_user_agent(user_agent),
+            "session_id": session_id,
+        })
+
+    def log_translation(
         self,
-        db: AsyncSession,
         user_id: str | None,
         input_text: str,
         output_text: str,
@@ -49,123 +186,100 @@ class AuditService:
         session_id: str | None = None,
         ip_address: str | None = None,
         user_agent: str | None = None,
-    ) -> AuditLog:
+    ) -> dict[str, Any]:
         """Log a translation operation."""
         
-        log_entry = AuditLog(
-            id=uuid4(),
-            timestamp=datetime.now(timezone.utc),
-            actor_id_hash=generate_anonymous_id(user_id) if user_id else "anonymous",
-            actor_role="clinician",
-            action_type="slang_translation",
-            resource_type="translation_query",
-            input_hash=self.hash_content(input_text),
-            output_hash=self.hash_content(output_text),
-            confidence_score=confidence,
-            pii_detected=pii_detected,
-            pii_stripped=pii_stripped,
-            safety_flags=safety_flags,
-            session_id=session_id,
-            ip_address_hash=self.hash_ip(ip_address, "paeon_audit"),
-            user_agent_hash=self.hash_content(user_agent)[:32] if user_agent else None,
-        )
-        
-        db.add(log_entry)
-        await db.flush()
-        
-        return log_entry
+        return self._write({
+            "id": uuid7(),
+            "timestamp": utc_now(),
+            "actor_id_hash": generate_anonymous_id(user_id) if user_id else "anonymous",
+            "actor_role": "clinician",
+            "action_type": "slang_translation",
+            "resource_type": "translation_query",
+            "input_hash": self.hash_content(input_text),
+            "output_hash": self.hash_content(output_text),
+            "confidence_score": confidence,
+            "pii_detected": pii_detected,
+            "pii_stripped": pii_stripped,
+            "safety_flags": safety_flags,
+            "session_id": session_id,
+            "ip_address_hash": self.hash_ip(ip_address),
+            "user_agent_hash": self.hash_user_agent(user_agent),
+        })
 
-    async def log_asset_generation(
+    def log_asset_generation(
         self,
-        db: AsyncSession,
         user_id: str | None,
         drug_name: str,
         asset_id: str,
         fair_balance_score: float,
         compliance_verified: bool,
         session_id: str | None = None,
-    ) -> AuditLog:
+    ) -> dict[str, Any]:
         """Log an asset generation operation."""
         
-        log_entry = AuditLog(
-            id=uuid4(),
-            timestamp=datetime.now(timezone.utc),
-            actor_id_hash=generate_anonymous_id(user_id) if user_id else "anonymous",
-            actor_role="clinician",
-            action_type="asset_generation",
-            resource_type="patient_asset",
-            resource_id=asset_id,
-            input_hash=self.hash_content(drug_name),
-            confidence_score=fair_balance_score,
-            pii_detected=False,
-            pii_stripped=False,
-            safety_flags=[] if compliance_verified else ["fair_balance_warning"],
-            session_id=session_id,
-        )
-        
-        db.add(log_entry)
-        await db.flush()
-        
-        return log_entry
+        return self._write({
+            "id": uuid7(),
+            "timestamp": utc_now(),
+            "actor_id_hash": generate_anonymous_id(user_id) if user_id else "anonymous",
+            "actor_role": "clinician",
+            "action_type": "asset_generation",
+            "resource_type": "patient_asset",
+            "resource_id": asset_id,
+            "input_hash": self.hash_content(drug_name),
+            "confidence_score": fair_balance_score,
+            "pii_detected": False,
+            "pii_stripped": False,
+            "safety_flags": [] if compliance_verified else ["fair_balance_warning"],
+            "session_id": session_id,
+        })
 
-    async def log_export(
+    def log_export(
         self,
-        db: AsyncSession,
         user_id: str | None,
         asset_id: str,
         export_format: str,
         session_id: str | None = None,
-    ) -> AuditLog:
+    ) -> dict[str, Any]:
         """Log an asset export operation."""
         
-        log_entry = AuditLog(
-            id=uuid4(),
-            timestamp=datetime.now(timezone.utc),
-            actor_id_hash=generate_anonymous_id(user_id) if user_id else "anonymous",
-            actor_role="clinician",
-            action_type=f"asset_export_{export_format}",
-            resource_type="patient_asset",
-            resource_id=asset_id,
-            pii_detected=False,
-            pii_stripped=False,
-            safety_flags=[],
-            session_id=session_id,
-        )
-        
-        db.add(log_entry)
-        await db.flush()
-        
-        return log_entry
+        return self._write({
+            "id": uuid7(),
+            "timestamp": utc_now(),
+            "actor_id_hash": generate_anonymous_id(user_id) if user_id else "anonymous",
+            "actor_role": "clinician",
+            "action_type": f"asset_export_{export_format}",
+            "resource_type": "patient_asset",
+            "resource_id": asset_id,
+            "pii_detected": False,
+            "pii_stripped": False,
+            "safety_flags": [],
+            "session_id": session_id,
+        })
 
-    async def log_rag_query(
+    def log_rag_query(
         self,
-        db: AsyncSession,
         user_id: str | None,
         query: str,
         results_count: int,
         sources_verified: bool,
         session_id: str | None = None,
-    ) -> AuditLog:
+    ) -> dict[str, Any]:
         """Log a RAG intelligence query."""
         
-        log_entry = AuditLog(
-            id=uuid4(),
-            timestamp=datetime.now(timezone.utc),
-            actor_id_hash=generate_anonymous_id(user_id) if user_id else "anonymous",
-            actor_role="clinician",
-            action_type="rag_query",
-            resource_type="drug_intelligence",
-            input_hash=self.hash_content(query),
-            pii_detected=False,
-            pii_stripped=False,
-            safety_flags=[] if sources_verified else ["unverified_sources"],
-            session_id=session_id,
-        )
-        
-        db.add(log_entry)
-        await db.flush()
-        
-        return log_entry
+        return self._write({
+            "id": uuid7(),
+            "timestamp": utc_now(),
+            "actor_id_hash": generate_anonymous_id(user_id) if user_id else "anonymous",
+            "actor_role": "clinician",
+            "action_type": "rag_query",
+            "resource_type": "drug_intelligence",
+            "input_hash": self.hash_content(query),
+            "pii_detected": False,
+            "pii_stripped": False,
+            "safety_flags": [] if sources_verified else ["unverified_sources"],
+            "session_id": session_id,
+        })
 
     async def get_logs(
         self,
@@ -177,39 +291,47 @@ class AuditService:
         page: int = 1,
         page_size: int = 50,
     ) -> dict[str, Any]:
-        """Retrieve audit logs with filtering."""
-        from sqlalchemy import select, func
+        """
+        Retrieve audit logs with filtering.
         
-        query = select(AuditLog)
-        count_query = select(func.count(AuditLog.id))
+        Entries are plain dicts with the AuditLogEntry fields.
+        """
+        from sqlalchemy import select, func
         
+        filters = []
         if actor_id:
-            actor_hash = generate_anonymous_id(actor_id)
-            query = query.where(AuditLog.actor_id_hash == actor_hash)
-            count_query = count_query.where(AuditLog.actor_id_hash == actor_hash)
-        
+            filters.append(AuditLog.actor_id_hash == generate_anonymous_id(actor_id))
         if action_type:
-            query = query.where(AuditLog.action_type == action_type)
-            count_query = count_query.where(AuditLog.action_type == action_type)
-        
+            filters.append(AuditLog.action_type == action_type)
         if start_date:
-            query = query.where(AuditLog.timestamp >= start_date)
-            count_query = count_query.where(AuditLog.timestamp >= start_date)
-        
+            filters.append(AuditLog.timestamp >= start_date)
         if end_date:
-            query = query.where(AuditLog.timestamp <= end_date)
-            count_query = count_query.where(AuditLog.timestamp <= end_date)
+            filters.append(AuditLog.timestamp <= end_date)
         
-        # Get total count
-        total_result = await db.execute(count_query)
-        total = total_result.scalar() or 0
-        
-        # Get paginated results
-        query = query.order_by(AuditLog.timestamp.desc())
-        query = query.offset((page - 1) * page_size).limit(page_size)
+        # One scan: the window count gives the filtered total on every row
+        query = (
+            select(*_ENTRY_COLUMNS, func.count().over().label("total"))
+            .where(*filters)
+            .order_by(AuditLog.timestamp.desc())
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
         
         result = await db.execute(query)
-        entries = result.scalars().all()
+        entries = [dict(row) for row in result.mappings()]
+        
+        if entries:
+            total = entries[0]["total"]
+            for entry in entries:
+                del entry["total"]
+        elif page > 1:
+            # Past the last page there are no rows to carry the count
+            total_result = await db.execute(
+                select(func.count()).select_from(AuditLog).where(*filters)
+            )
+            total = total_result.scalar() or 0
+        else:
+            total = 0
         
         return {
             "entries": entries,
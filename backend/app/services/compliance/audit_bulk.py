@@ -0,0 +1,175 @@
+"""
+Paeon AI - Bulk Audit Writer
+
+Buffers audit log rows in-process and writes them in batches, so audit
+logging costs one COPY per batch instead of one INSERT per event.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+import orjson
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.models import AuditLog
+from app.db.session import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+# Column order used for COPY records
+AUDIT_COLUMNS: tuple[str, ...] = tuple(column.name for column in AuditLog.__table__.columns)
+
+# JSON columns must be pre-encoded for asyncpg's COPY codec
+_JSON_COLUMNS = frozenset({"safety_flags"})
+
+
+def full_row(row: dict[str, Any]) -> dict[str, Any]:
+    """
+    A row with every audit column as a key, missing ones set to None.
+
+    The `log_*` helpers each set a different subset of columns, while a
+    multi-row INSERT or executemany takes its column list from the first
+    row; rows must share one key set to be written together.
+    """
+    return {name: row.get(name) for name in AUDIT_COLUMNS}
+
+
+class AuditBulkWriter:
+    """
+    Background writer for audit log rows.
+
+    Rows are queued by `enqueue` and drained by a worker task in batches of
+    up to `max_batch_size` rows or `flush_interval` seconds, whichever comes
+    first. Large batches are written with asyncpg's binary COPY; batches
+    smaller than `copy_threshold` use a single multi-row INSERT, which is
+    cheaper than setting up a COPY for a handful of rows.
+
+    Rows of a batch that fails to write are kept (up to `max_retained`,
+    oldest dropped first) and retried every `retry_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        copy_threshold: int = 100,
+        retry_interval: float = 30.0,
+        max_retained: int = 50_000,
+    ):
+        """Initialize the writer; call `start` to begin draining."""
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.copy_threshold = copy_threshold
+        self.retry_interval = retry_interval
+        self._queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+        self._worker: asyncio.Task | None = None
+        self._failed: deque[dict[str, Any]] = deque(maxlen=max_retained)
+        self._retry_at = 0.0
+
+    def start(self) -> None:
+        """Start the background drain task."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the drain task and flush anything still queued."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        pending = list(self._failed)
+        self._failed.clear()
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.max_batch_size):
+            await self._flush(pending[start:start + self.max_batch_size])
+        if self._failed:
+            logger.error("Discarding %d unwritten audit log rows at shutdown", len(self._failed))
+            self._failed.clear()
+
+    def enqueue(self, row: dict[str, Any]) -> None:
+        """Queue a fully populated audit row (id and timestamp included)."""
+        self._queue.put_nowait(row)
+
+    async def _run(self) -> None:
+        """Collect queued rows into batches and flush them."""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._retry_failed()
+            try:
+                # While rows await a retry, wake up for it even if idle
+                first = await asyncio.wait_for(
+                    self._queue.get(), self.retry_interval if self._failed else None
+                )
+            except asyncio.TimeoutError:
+                continue
+            batch = [first]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._flush(batch)
+
+    async def _retry_failed(self) -> None:
+        """Rewrite retained rows once the retry interval has passed."""
+        if not self._failed or time.monotonic() < self._retry_at:
+            return
+        rows = list(self._failed)
+        self._failed.clear()
+        for start in range(0, len(rows), self.max_batch_size):
+            await self._flush(rows[start:start + self.max_batch_size])
+
+    async def _flush(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Write one batch of rows.
+
+        Failures are logged, not raised, and the rows are retained for a
+        later retry.
+        """
+        if not rows:
+            return
+        try:
+            async with async_session_maker() as session:
+                if len(rows) < self.copy_threshold:
+                    await session.execute(
+                        pg_insert(AuditLog).values([full_row(row) for row in rows])
+                    )
+                else:
+                    conn = await session.connection()
+                    raw = await conn.get_raw_connection()
+                    await raw.driver_connection.copy_records_to_table(
+                        AuditLog.__tablename__,
+                        records=[self._to_record(row) for row in rows],
+                        columns=AUDIT_COLUMNS,
+                    )
+                await session.commit()
+        except Exception:
+            logger.exception("Failed to write %d audit log rows; retaining them for retry", len(rows))
+            dropped = len(self._failed) + len(rows) - self._failed.maxlen
+            if dropped > 0:
+                logger.error("Audit retry buffer full; dropping %d oldest rows", dropped)
+            self._failed.extend(rows)
+            self._retry_at = time.monotonic() + self.retry_interval
+
+    @staticmethod
+    def _to_record(row: dict[str, Any]) -> tuple:
+        """Order a row's values for COPY, encoding JSON columns."""
+        return tuple(
+            orjson.dumps(row.get(name)).decode() if name in _JSON_COLUMNS else row.get(name)
+            for name in AUDIT_COLUMNS
+        )
+
+
+# Singleton instance
+audit_bulk_writer = AuditBulkWriter()
@@ -0,0 +1,199 @@
+"""
+Paeon AI - Pattern Matching Backends
+
+Regex compilation shared by the compliance scanners, and word counting
+for Fair Balance checks.
+
+- google-re2 (linear-time, no backtracking) is used for ASCII text when
+  installed, with a per-pattern fallback to the stdlib `re` for
+  constructs RE2 rejects.
+- Hyperscan, when installed, provides a multi-pattern prefilter: one
+  linear pass over the text reports which patterns can match at all, so
+  the per-pattern regexes only run for those.
+- pyahocorasick, when installed, backs the literal prefilter (required
+  trigger phrases per pattern group) with a single automaton pass.
+
+All are optional; without them everything runs on `re` and `str` search.
+"""
+
+import re
+from typing import Any
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class CompiledPattern:
+    """
+    A pattern compiled for both RE2 and `re`.
+
+    RE2's \b, \d, \w and \s are ASCII-only while Python's are Unicode,
+    so RE2 is only used on ASCII text, where the two agree. Non-ASCII
+    input (e.g. Devanagari digits) always goes through `re`.
+    """
+
+    __slots__ = ("_re", "_re2")
+
+    def __init__(self, pattern: str, ignore_case: bool = True):
+        """Compile pattern with `re`, and with RE2 when it's available."""
+        self._re = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        self._re2 = None
+        if re2 is not None:
+            try:
+                self._re2 = re2.compile(f"(?i){pattern}" if ignore_case else pattern)
+            except re2.error:
+                pass
+
+    def _engine(self, text: str) -> Any:
+        """Pick the engine for a given input."""
+        if self._re2 is not None and text.isascii():
+            return self._re2
+        return self._re
+
+    def search(self, text: str) -> Any:
+        return self._engine(text).search(text)
+
+    def findall(self, text: str) -> list:
+        return self._engine(text).findall(text)
+
+    def finditer(self, text: str) -> Any:
+        return self._engine(text).finditer(text)
+
+    def sub(self, repl: Any, text: str, count: int = 0) -> str:
+        return self._engine(text).sub(repl, text, count)
+
+    def subn(self, repl: Any, text: str, count: int = 0) -> tuple[str, int]:
+        return self._engine(text).subn(repl, text, count)
+
+
+def compile_pattern(pattern: str, ignore_case: bool = True) -> CompiledPattern:
+    """Compile a pattern for the fastest available engine."""
+    return CompiledPattern(pattern, ignore_case)
+
+
+# One C-level scan per count instead of a split() list per string
+_WORD_RE = re.compile(r"\S+")
+
+
+def count_words(*texts: str) -> int:
+    """Number of whitespace-separated words across texts."""
+    return len(_WORD_RE.findall(" ".join(texts)))
+
+
+class MultiPatternPrefilter:
+    """
+    Single-pass check of which named patterns occur in a text.
+
+    Backed by a Hyperscan database compiled once at construction. Like
+    RE2, Hyperscan's \b is ASCII-only, so only ASCII text is prefiltered.
+    When the prefilter can't answer (Hyperscan unavailable, a pattern
+    rejected, or non-ASCII text) `candidates` returns None and callers
+    should run every pattern.
+    """
+
+    def __init__(self, patterns: dict[str, str], ignore_case: bool = True):
+        """Compile the named patterns into one Hyperscan database."""
+        self._names = list(patterns)
+        self._db = None
+        if hyperscan is None or not patterns:
+            return
+
+        flags = hyperscan.HS_FLAG_SINGLEMATCH
+        if ignore_case:
+            flags |= hyperscan.HS_FLAG_CASELESS
+
+        try:
+            db = hyperscan.Database()
+            db.compile(
+                expressions=[pattern.encode() for pattern in patterns.values()],
+                ids=list(range(len(self._names))),
+                elements=len(self._names),
+                flags=[flags] * len(self._names),
+            )
+        except Exception:
+            return
+        self._db = db
+
+    @property
+    def enabled(self) -> bool:
+        """Whether a compiled Hyperscan database is in use."""
+        return self._db is not None
+
+    def candidates(self, text: str) -> set[str] | None:
+        """Names of patterns that match somewhere in text, or None if unknown."""
+        if self._db is None or not text.isascii():
+            return None
+
+        found: set[str] = set()
+
+        def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+            found.add(self._names[pattern_id])
+
+        self._db.scan(text.encode(), match_event_handler=on_match)
+        return found
+
+
+class LiteralPrefilter:
+    """
+    Single-pass check of which named groups have a trigger literal in a text.
+    
+    Each group lists lowercase literals of which every one of its
+    patterns needs at least one; a group with no literal present can't
+    match. Backed by an Aho-Corasick automaton when pyahocorasick is
+    installed, else one substring search per literal. Only ASCII text is
+    prefiltered, since case folding elsewhere can differ from
+    `str.lower()`; `candidates` returns None for anything else.
+    
+    Without the automaton, only literals whose first character occurs in
+    the text are searched for.
+    """
+
+    def __init__(self, groups: dict[str, tuple[str, ...]]):
+        """Index the literals of every group."""
+        self._literals: dict[str, set[str]] = {}
+        for name, literals in groups.items():
+            for literal in literals:
+                self._literals.setdefault(literal, set()).add(name)
+        
+        # Fallback path: literals grouped by first character, so only
+        # those whose first character occurs in the text are searched
+        self._by_first_char: dict[str, list[tuple[str, set[str]]]] = {}
+        for literal, names in self._literals.items():
+            self._by_first_char.setdefault(literal[0], []).append((literal, names))
+        
+        self._automaton = None
+        if ahocorasick is not None and self._literals:
+            automaton = ahocorasick.Automaton()
+            for literal, names in self._literals.items():
+                automaton.add_word(literal, frozenset(names))
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def candidates(self, text: str) -> set[str] | None:
+        """Names of groups with a literal somewhere in text, or None if unknown."""
+        if not text.isascii():
+            return None
+        
+        lowered = text.lower()
+        found: set[str] = set()
+        if self._automaton is not None:
+            for _, names in self._automaton.iter(lowered):
+                found |= names
+        else:
+            for char in self._by_first_char.keys() & set(lowered):
+                for literal, names in self._by_first_char[char]:
+                    if literal in lowered:
+                        found |= names
+        return found
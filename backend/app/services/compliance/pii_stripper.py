@@ -14,9 +14,92 @@ PII Types Detected:
 - Addresses
 """
 
-import re
+import asyncio
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 
+from app.core.cache import LRUCache
+from app.core.config import settings
+from app.services.compliance.matching import MultiPatternPrefilter, compile_pattern
+
+# Worker processes for large documents; created on first use
+_process_pool: ProcessPoolExecutor | None = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Process pool for CPU-bound stripping, created lazily."""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=settings.pii_process_workers)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes, if any were started."""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False, cancel_futures=True)
+        _process_pool = None
+
+
+# Verhoeff dihedral-group tables (used by Aadhaar check digits)
+_VERHOEFF_D = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 2, 3, 4, 0, 6, 7, 8, 9, 5),
+    (2, 3, 4, 0, 1, 7, 8, 9, 5, 6),
+    (3, 4, 0, 1, 2, 8, 9, 5, 6, 7),
+    (4, 0, 1, 2, 3, 9, 5, 6, 7, 8),
+    (5, 9, 8, 7, 6, 0, 4, 3, 2, 1),
+    (6, 5, 9, 8, 7, 1, 0, 4, 3, 2),
+    (7, 6, 5, 9, 8, 2, 1, 0, 4, 3),
+    (8, 7, 6, 5, 9, 3, 2, 1, 0, 4),
+    (9, 8, 7, 6, 5, 4, 3, 2, 1, 0),
+)
+_VERHOEFF_P = (
+    (0, 1, 2, 3, 4, 5, 6, 7, 8, 9),
+    (1, 5, 7, 6, 2, 8, 3, 0, 9, 4),
+    (5, 8, 0, 3, 7, 9, 6, 1, 4, 2),
+    (8, 9, 1, 6, 0, 4, 3, 5, 2, 7),
+    (9, 4, 5, 3, 1, 2, 6, 8, 7, 0),
+    (4, 2, 8, 6, 5, 7, 3, 9, 0, 1),
+    (2, 7, 9, 3, 8, 0, 6, 4, 1, 5),
+    (7, 0, 4, 6, 9, 1, 3, 2, 5, 8),
+)
+
+
+def _digits(text: str) -> list[int]:
+    """Decimal digits of a matched number, separators dropped."""
+    return [int(c) for c in text if c.isdecimal()]
+
+
+def _is_aadhaar(text: str) -> bool:
+    """Aadhaar numbers never start with 0 or 1 and end in a Verhoeff check digit."""
+    digits = _digits(text)
+    if digits[0] < 2:
+        return False
+    check = 0
+    for i, digit in enumerate(reversed(digits)):
+        check = _VERHOEFF_D[check][_VERHOEFF_P[i % 8][digit]]
+    return check == 0
+
+
+def _is_card_number(text: str) -> bool:
+    """Card numbers end in a Luhn check digit."""
+    total = 0
+    for i, digit in enumerate(reversed(_digits(text))):
+        if i % 2:
+            digit *= 2
+            if digit > 9:
+                digit -= 9
+        total += digit
+    return total % 10 == 0
+
+
+def _strip_in_worker(text: str) -> tuple[str, dict[str, Any]]:
+    """Process pool task; workers reuse their module's compiled singleton."""
+    return pii_stripper.strip_pii(text)
+
 
 class PIIStripper:
     """
@@ -44,6 +127,12 @@ class PIIStripper:
             r'\b\d{10,15}\b',
             "[PHONE_REDACTED]"
         ),
+        # Before aadhaar: its 12 digits would otherwise match the start
+        # of a 16-digit card number
+        "credit_card": (
+            r'\b(?:\d{4}[\s-]?){3}\d{4}\b',
+            "[CARD_REDACTED]"
+        ),
         "aadhaar": (
             r'\b\d{4}[\s-]?\d{4}[\s-]?\d{4}\b',
             "[AADHAAR_REDACTED]"
@@ -64,16 +153,27 @@ class PIIStripper:
             r'\b\d{1,2}[-/]\d{1,2}[-/]\d{2,4}\b',
             "[DATE_REDACTED]"
         ),
-        "credit_card": (
-            r'\b(?:\d{4}[\s-]?){3}\d{4}\b',
-            "[CARD_REDACTED]"
-        ),
         "ip_address": (
             r'\b(?:\d{1,3}\.){3}\d{1,3}\b',
             "[IP_REDACTED]"
         ),
     }
 
+    # Region-specific phone formats, and those kept per deployment region
+    REGIONAL_PATTERNS = ("phone_india", "phone_us")
+    REGION_PHONE_PATTERNS = {
+        "IN": ("phone_india",),
+        "US": ("phone_us",),
+    }
+
+    # Checksums for number formats that have one; a match that fails its
+    # checksum is still redacted, but reported as an unverified ID
+    CHECKSUMS = {
+        "aadhaar": _is_aadhaar,
+        "credit_card": _is_card_number,
+    }
+    UNVERIFIED_ID = ("id_number", "[ID_REDACTED]")
+
     # Common name patterns (will be refined with NER)
     NAME_PATTERNS = [
         r'\b(?:Mr\.|Mrs\.|Ms\.|Dr\.|Prof\.)\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\b',
@@ -86,81 +186,189 @@ class PIIStripper:
         "devi", "sharma", "gupta", "patel", "khan", "reddy"
     ]
 
-    def __init__(self):
-        """Initialize the PII stripper."""
+    def __init__(self, region: str | None = None):
+        """
+        Initialize the PII stripper.
+        
+        `region` ("IN", "US" or "auto", default `settings.pii_region`)
+        limits the region-specific phone formats that are matched.
+        """
+        self.region = region or settings.pii_region
         self._compile_patterns()
+        
+        # Short patient phrases repeat often; results are pure functions
+        # of the text
+        self._strip_results = LRUCache(maxsize=4096)
 
     def _compile_patterns(self):
         """Pre-compile regex patterns for efficiency."""
-        self.compiled_patterns = {}
-        for name, (pattern, replacement) in self.PATTERNS.items():
-            self.compiled_patterns[name] = (
-                re.compile(pattern, re.IGNORECASE),
-                replacement
-            )
+        # Phone formats of other regions are left out ("auto" keeps all);
+        # unformatted numbers from anywhere still match phone_generic
+        kept = self.REGION_PHONE_PATTERNS.get(self.region, self.REGIONAL_PATTERNS)
+        patterns = {
+            name: entry for name, entry in self.PATTERNS.items()
+            if name not in self.REGIONAL_PATTERNS or name in kept
+        }
         
-        self.name_patterns = [
-            re.compile(p, re.IGNORECASE) for p in self.NAME_PATTERNS
-        ]
-
-    def detect_pii(self, text: str) -> dict[str, Any]:
-        """
-        Detect PII in text without modifying it.
+        # All patterns as one alternation of named groups, in PATTERNS
+        # order then names, so a single scan finds, classifies and
+        # replaces every match; `lastgroup` says which pattern hit
+        self._groups: dict[str, tuple[str, str]] = {
+            name: (name, replacement) for name, (_, replacement) in patterns.items()
+        }
+        alternatives = [f"(?P<{name}>{pattern})" for name, (pattern, _) in patterns.items()]
+        for i, pattern in enumerate(self.NAME_PATTERNS):
+            self._groups[self._name_key(i)] = ("name", "[NAME_REDACTED]")
+            alternatives.append(f"(?P<{self._name_key(i)}>{pattern})")
+        self._combined = compile_pattern("|".join(alternatives))
         
-        Returns detection report with types and counts.
-        """
+        # Report types in pattern order, then unverified IDs and names,
+        # with their confidence scores
+        self._report_order = tuple(
+            (pii_type, 0.95) for pii_type in (*patterns, self.UNVERIFIED_ID[0])
+        ) + (("name", 0.8),)
+        
+        # One pass over the text tells whether any pattern can match at all
+        self._prefilter = MultiPatternPrefilter({
+            **{name: pattern for name, (pattern, _) in patterns.items()},
+            **{self._name_key(i): p for i, p in enumerate(self.NAME_PATTERNS)},
+        })
+        
+        # Display masking (see mask_partial)
+        self._email_mask_pattern = compile_pattern(
+            r'\b([A-Za-z0-9._%+-]+)@([A-Za-z0-9.-]+)\.([A-Z|a-z]{2,})\b', ignore_case=False
+        )
+        # A country code counts only when followed by a separator;
+        # otherwise the optional prefix would take (and leave unmasked)
+        # the leading digits of a bare number
+        self._phone_mask_pattern = compile_pattern(
+            r'\b(\+?\d{1,3}[\s-])?(\d{3,})(\d{4})\b', ignore_case=False
+        )
+
+    @staticmethod
+    def _name_key(index: int) -> str:
+        """Group name for a name pattern."""
+        return f"name_{index}"
+
+    def _classify(self, match: Any) -> tuple[str, str]:
+        """PII type and placeholder for a combined-pattern match."""
+        group = match.lastgroup
+        checksum = self.CHECKSUMS.get(group)
+        if checksum is not None and not checksum(match.group()):
+            return self.UNVERIFIED_ID
+        return self._groups[group]
+
+    def _report(self, counts: dict[str, int]) -> dict[str, Any]:
+        """Detection report from per-type match counts."""
         detections = {
-            "pii_detected": False,
+            "pii_detected": bool(counts),
             "pii_types": [],
             "pii_count": 0,
             "confidence_scores": {},
+            "match_counts": {},
         }
+        
+        for pii_type, confidence in self._report_order:
+            count = counts.get(pii_type)
+            if not count:
+                continue
+            detections["pii_types"].append(pii_type)
+            detections["pii_count"] += count
+            detections["confidence_scores"][pii_type] = confidence
+            detections["match_counts"][pii_type] = count
+        
+        return detections
 
-        for pii_type, (pattern, _) in self.compiled_patterns.items():
-            matches = pattern.findall(text)
-            if matches:
-                detections["pii_detected"] = True
-                detections["pii_types"].append(pii_type)
-                detections["pii_count"] += len(matches)
-                detections["confidence_scores"][pii_type] = 0.95
-
-        # Check for names
-        for name_pattern in self.name_patterns:
-            matches = name_pattern.findall(text)
-            if matches:
-                detections["pii_detected"] = True
-                if "name" not in detections["pii_types"]:
-                    detections["pii_types"].append("name")
-                detections["pii_count"] += len(matches)
-                detections["confidence_scores"]["name"] = 0.8
+    def _may_contain_pii(self, text: str) -> bool:
+        """False only when the prefilter rules out every pattern."""
+        candidates = self._prefilter.candidates(text)
+        return candidates is None or bool(candidates)
 
-        return detections
+    def detect_pii(self, text: str) -> dict[str, Any]:
+        """
+        Detect PII in text without modifying it.
+        
+        Returns detection report with types and counts.
+        """
+        counts: dict[str, int] = {}
+        if self._may_contain_pii(text):
+            for match in self._combined.finditer(text):
+                pii_type = self._classify(match)[0]
+                counts[pii_type] = counts.get(pii_type, 0) + 1
+        
+        return self._report(counts)
 
     def strip_pii(self, text: str) -> tuple[str, dict[str, Any]]:
         """
         Strip all detected PII from text.
         
+        Detection and replacement share one scan: the report is built
+        from the matches that were replaced.
+        
         Returns:
             tuple: (sanitized_text, detection_report)
         """
-        original_length = len(text)
-        sanitized = text
-
-        # Apply all pattern replacements
-        for pii_type, (pattern, replacement) in self.compiled_patterns.items():
-            sanitized = pattern.sub(replacement, sanitized)
-
-        # Apply name pattern replacements
-        for name_pattern in self.name_patterns:
-            sanitized = name_pattern.sub("[NAME_REDACTED]", sanitized)
+        # Keyed by digest so raw text (which may hold PII) isn't retained
+        key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+        cached = self._strip_results.get(key)
+        if cached is not None:
+            sanitized, report = cached
+            return sanitized, self._copy_report(report)
+        
+        counts: dict[str, int] = {}
+        
+        def replace(match) -> str:
+            pii_type, replacement = self._classify(match)
+            counts[pii_type] = counts.get(pii_type, 0) + 1
+            return replacement
+        
+        sanitized = self._combined.sub(replace, text) if self._may_contain_pii(text) else text
 
         # Generate report
-        report = self.detect_pii(text)
-        report["original_length"] = original_length
+        report = self._report(counts)
+        report["original_length"] = len(text)
         report["stripped_length"] = len(sanitized)
         report["detection_model_version"] = "1.0.0"
 
-        return sanitized, report
+        self._strip_results.set(key, (sanitized, report))
+        return sanitized, self._copy_report(report)
+
+    async def astrip_pii(self, text: str) -> tuple[str, dict[str, Any]]:
+        """
+        Strip PII without blocking the event loop on large documents.
+        
+        Short texts (the common case) are stripped inline, where IPC
+        would cost more than the scan; texts of at least
+        `pii_offload_min_chars` run in a worker process.
+        """
+        if settings.pii_process_workers < 1 or len(text) < settings.pii_offload_min_chars:
+            return self.strip_pii(text)
+        
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_process_pool(), _strip_in_worker, text)
+
+    def strip_pii_batch(self, texts: list[str]) -> list[tuple[str, dict[str, Any]]]:
+        """
+        Strip PII from many texts across worker processes.
+        
+        Results are in input order.
+        """
+        workers = settings.pii_process_workers
+        if workers < 1 or len(texts) < 2:
+            return [self.strip_pii(text) for text in texts]
+        
+        chunksize = max(1, len(texts) // (4 * workers))
+        return list(_get_process_pool().map(_strip_in_worker, texts, chunksize=chunksize))
+
+    @staticmethod
+    def _copy_report(report: dict[str, Any]) -> dict[str, Any]:
+        """Copy of a cached report that callers are free to modify."""
+        return {
+            **report,
+            "pii_types": list(report["pii_types"]),
+            "confidence_scores": dict(report["confidence_scores"]),
+            "match_counts": dict(report["match_counts"]),
+        }
 
     def mask_partial(self, text: str, mask_char: str = "*") -> str:
         """
@@ -171,8 +379,6 @@ class PIIStripper:
         masked = text
 
         # Mask emails
-        email_pattern = re.compile(r'\b([A-Za-z0-9._%+-]+)@([A-Za-z0-9.-]+)\.([A-Z|a-z]{2,})\b')
-        
         def mask_email(match):
             local = match.group(1)
             domain = match.group(2)
@@ -181,18 +387,16 @@ class PIIStripper:
             masked_domain = domain[0] + mask_char * (len(domain) - 1) if len(domain) > 1 else domain
             return f"{masked_local}@{masked_domain}.{tld}"
         
-        masked = email_pattern.sub(mask_email, masked)
+        masked = self._email_mask_pattern.sub(mask_email, masked)
 
         # Mask phone numbers (keep last 4 digits)
-        phone_pattern = re.compile(r'\b(\+?\d{1,3}[\s-]?)?(\d{3,})(\d{4})\b')
-        
         def mask_phone(match):
             prefix = match.group(1) or ""
             middle = mask_char * len(match.group(2))
             suffix = match.group(3)
             return f"{prefix}{middle}{suffix}"
         
-        masked = phone_pattern.sub(mask_phone, masked)
+        masked = self._phone_mask_pattern.sub(mask_phone, masked)
 
         return masked
 
@@ -200,10 +404,12 @@ class PIIStripper:
         """
         Validate that text contains no detectable PII.
         
-        Returns True if clean, False if PII detected.
+        Returns True if clean, False if PII detected. Stops at the
+        first match instead of counting every one.
         """
-        detection = self.detect_pii(text)
-        return not detection["pii_detected"]
+        if not self._may_contain_pii(text):
+            return True
+        return self._combined.search(text) is None
 
 
 # Singleton instance
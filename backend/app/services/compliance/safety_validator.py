@@ -13,9 +13,24 @@ The system must NEVER:
 This validator catches and sanitizes any unsafe outputs.
 """
 
-import re
 from typing import Any
 
+from app.core.cache import LRUCache
+from app.services.compliance.matching import (
+    LiteralPrefilter,
+    MultiPatternPrefilter,
+    compile_pattern,
+    count_words,
+)
+
+# Appended by add_required_disclaimer
+_OUTPUT_DISCLAIMER = (
+    "\n\n---\n"
+    "⚠️ IMPORTANT: This is for Healthcare Professional use only. "
+    "This system provides clinical terminology mapping, not medical diagnosis. "
+    "Always consult qualified healthcare providers for medical decisions."
+)
+
 
 class SafetyValidator:
     """
@@ -66,6 +81,25 @@ class SafetyValidator:
         r'\bconsider\s+(?:surgery|chemotherapy|radiation|transplant)',
     ]
 
+    # Lowercase literals per category; every pattern of a category needs
+    # at least one of them (keep in sync when adding patterns)
+    CATEGORY_TRIGGERS = {
+        "diagnostic": (
+            "you have", "you've", "you are suffering from", "diagnosis",
+            "this ", "test results ",
+        ),
+        "prescriptive": (
+            "take", "recommend", "suggest", "advise", "prescription",
+            "start ", "you need", "dosage",
+        ),
+        "prognosis": (
+            "this ", "your condition will", "expect", "likely to", "prognosis",
+        ),
+        "treatment": (
+            "you should", "treatment options include", "recommend", "consider",
+        ),
+    }
+
     # Allowed disclaimer patterns
     REQUIRED_DISCLAIMERS = [
         "For Healthcare Professional use only",
@@ -77,77 +111,87 @@ class SafetyValidator:
     def __init__(self):
         """Initialize the safety validator."""
         self._compile_patterns()
+        
+        # Curated and cached mappings produce the same outputs over and
+        # over; validation is a pure function of them
+        self._results = LRUCache(maxsize=4096)
 
     def _compile_patterns(self):
-        """Pre-compile regex patterns."""
-        self.diagnostic_patterns = [
-            re.compile(p, re.IGNORECASE) for p in self.DIAGNOSTIC_PATTERNS
-        ]
-        self.prescriptive_patterns = [
-            re.compile(p, re.IGNORECASE) for p in self.PRESCRIPTIVE_PATTERNS
-        ]
-        self.prognosis_patterns = [
-            re.compile(p, re.IGNORECASE) for p in self.PROGNOSIS_PATTERNS
-        ]
-        self.treatment_patterns = [
-            re.compile(p, re.IGNORECASE) for p in self.TREATMENT_PATTERNS
-        ]
+        """Pre-compile regex patterns, one alternation per category."""
+        sources = {
+            category: "|".join(f"(?:{p})" for p in patterns)
+            for category, patterns in (
+                ("diagnostic", self.DIAGNOSTIC_PATTERNS),
+                ("prescriptive", self.PRESCRIPTIVE_PATTERNS),
+                ("prognosis", self.PROGNOSIS_PATTERNS),
+                ("treatment", self.TREATMENT_PATTERNS),
+            )
+        }
+        self.category_patterns = {
+            category: compile_pattern(source) for category, source in sources.items()
+        }
+        
+        # One pass over the text tells which categories can match at all:
+        # Hyperscan over the full patterns, else their trigger literals
+        self._prefilter = MultiPatternPrefilter(sources)
+        self._literal_prefilter = LiteralPrefilter(self.CATEGORY_TRIGGERS)
+        
+        # Rewrites applied by _sanitize_output, fused into one alternation;
+        # no replacement can create a match for another rule, so one pass
+        # gives the same result as applying them in turn
+        self._sanitize_replacements = {
+            "you_have": "symptoms consistent with ",
+            "diagnosis": "clinical interpretation",
+            "treatment": "management options",
+        }
+        self._sanitize_pattern = compile_pattern(
+            r'(?P<you_have>\byou have\s+)|(?P<diagnosis>\bdiagnosis\b)|(?P<treatment>\btreatment\b)'
+        )
 
-    def check_diagnostic_language(self, text: str) -> dict[str, Any]:
-        """Check for diagnostic language."""
-        violations = []
-        for pattern in self.diagnostic_patterns:
-            matches = pattern.findall(text)
-            if matches:
-                violations.extend(matches)
+    def _check_category(self, category: str, text: str) -> dict[str, Any]:
+        """Collect violations of one category with a single scan."""
+        violations = self.category_patterns[category].findall(text)
         
         return {
-            "category": "diagnostic",
+            "category": category,
             "is_safe": len(violations) == 0,
             "violations": violations,
         }
 
+    def _matching_categories(self, text: str) -> list[str]:
+        """
+        Categories with at least one match, in check order.
+        
+        Hyperscan answers exactly in one pass. Otherwise the literal
+        prefilter narrows the categories in one pass (ASCII text) and a
+        search per remaining category, stopping at the first match,
+        confirms them; either way safe text builds no violation lists.
+        """
+        candidates = self._prefilter.candidates(text)
+        if candidates is not None:
+            return [category for category in self.category_patterns if category in candidates]
+        
+        candidates = self._literal_prefilter.candidates(text)
+        return [
+            category for category, pattern in self.category_patterns.items()
+            if (candidates is None or category in candidates) and pattern.search(text)
+        ]
+
+    def check_diagnostic_language(self, text: str) -> dict[str, Any]:
+        """Check for diagnostic language."""
+        return self._check_category("diagnostic", text)
+
     def check_prescriptive_language(self, text: str) -> dict[str, Any]:
         """Check for prescriptive language."""
-        violations = []
-        for pattern in self.prescriptive_patterns:
-            matches = pattern.findall(text)
-            if matches:
-                violations.extend(matches)
-        
-        return {
-            "category": "prescriptive",
-            "is_safe": len(violations) == 0,
-            "violations": violations,
-        }
+        return self._check_category("prescriptive", text)
 
     def check_prognosis_language(self, text: str) -> dict[str, Any]:
         """Check for prognosis language."""
-        violations = []
-        for pattern in self.prognosis_patterns:
-            matches = pattern.findall(text)
-            if matches:
-                violations.extend(matches)
-        
-        return {
-            "category": "prognosis",
-            "is_safe": len(violations) == 0,
-            "violations": violations,
-        }
+        return self._check_category("prognosis", text)
 
     def check_treatment_language(self, text: str) -> dict[str, Any]:
         """Check for treatment recommendation language."""
-        violations = []
-        for pattern in self.treatment_patterns:
-            matches = pattern.findall(text)
-            if matches:
-                violations.extend(matches)
-        
-        return {
-            "category": "treatment",
-            "is_safe": len(violations) == 0,
-            "violations": violations,
-        }
+        return self._check_category("treatment", text)
 
     def validate_output(self, clinical_term: str, rationale: str) -> dict[str, Any]:
         """
@@ -155,13 +199,19 @@ class SafetyValidator:
         
         Returns safety assessment with sanitized output if needed.
         """
+        key = (clinical_term, rationale)
+        cached = self._results.get(key)
+        if cached is not None:
+            return {**cached, "categories_violated": list(cached["categories_violated"])}
+        
         combined_text = f"{clinical_term} {rationale}"
         
+        # Categories are scanned separately so a long match in one (e.g.
+        # "you have ... condition") can't hide a match in another; only
+        # categories that match at all have their violations collected
         checks = [
-            self.check_diagnostic_language(combined_text),
-            self.check_prescriptive_language(combined_text),
-            self.check_prognosis_language(combined_text),
-            self.check_treatment_language(combined_text),
+            self._check_category(category, combined_text)
+            for category in self._matching_categories(combined_text)
         ]
         
         all_violations = []
@@ -186,7 +236,8 @@ class SafetyValidator:
             result["reason"] = f"Output contains {', '.join(categories_violated)} language"
             result["sanitized_output"] = self._sanitize_output(clinical_term)
         
-        return result
+        self._results.set(key, result)
+        return {**result, "categories_violated": list(categories_violated)}
 
     def _sanitize_output(self, text: str) -> str:
         """
@@ -194,43 +245,15 @@ class SafetyValidator:
         
         Converts diagnostic statements to symptom descriptions.
         """
-        sanitized = text
-        
-        # Replace "you have X" with "symptoms consistent with X"
-        sanitized = re.sub(
-            r'\byou have\s+',
-            'symptoms consistent with ',
-            sanitized,
-            flags=re.IGNORECASE
+        # "you have X" -> "symptoms consistent with X", "diagnosis" ->
+        # "clinical interpretation", "treatment" -> "management options"
+        return self._sanitize_pattern.sub(
+            lambda match: self._sanitize_replacements[match.lastgroup], text
         )
-        
-        # Replace "diagnosis" with "clinical interpretation"
-        sanitized = re.sub(
-            r'\bdiagnosis\b',
-            'clinical interpretation',
-            sanitized,
-            flags=re.IGNORECASE
-        )
-        
-        # Replace "treatment" with "management options"
-        sanitized = re.sub(
-            r'\btreatment\b',
-            'management options',
-            sanitized,
-            flags=re.IGNORECASE
-        )
-        
-        return sanitized
 
     def add_required_disclaimer(self, text: str) -> str:
         """Add required compliance disclaimer to output."""
-        disclaimer = (
-            "\n\n---\n"
-            "⚠️ IMPORTANT: This is for Healthcare Professional use only. "
-            "This system provides clinical terminology mapping, not medical diagnosis. "
-            "Always consult qualified healthcare providers for medical decisions."
-        )
-        return text + disclaimer
+        return text + _OUTPUT_DISCLAIMER
 
     def validate_fair_balance(self, benefits: list[str], risks: list[str]) -> dict[str, Any]:
         """
@@ -238,8 +261,8 @@ class SafetyValidator:
         
         Benefits and risks must be roughly equal in prominence.
         """
-        benefit_word_count = sum(len(b.split()) for b in benefits)
-        risk_word_count = sum(len(r.split()) for r in risks)
+        benefit_word_count = count_words(*benefits)
+        risk_word_count = count_words(*risks)
         
         # Fair Balance requires risks to have at least 70% of benefit word count
         balance_ratio = risk_word_count / max(benefit_word_count, 1)
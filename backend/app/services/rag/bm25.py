@@ -0,0 +1,225 @@
+"""
+Paeon AI - BM25 Keyword Scoring
+
+Okapi BM25 over the small candidate sets returned by upstream searches.
+Statistics (idf, average length) are computed per call from the
+candidates themselves; there is no persistent index.
+
+With NumPy installed the candidates are laid out as arrays (one term
+frequency column per query term) and scored in one vectorized pass;
+with Numba as well, that pass is JIT-compiled and runs across cores,
+and top-k retrieval uses MaxScore to stop scoring documents that can
+no longer make the cut.
+"""
+
+import heapq
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercase alphanumeric terms of a text."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def build_soa(documents: Sequence[str], terms: Sequence[str]) -> tuple:
+    """
+    Lay out documents as arrays for scoring against `terms`.
+
+    Returns `(doc_ids, tf, dl)`: int32[N] document indexes, float32[N, T]
+    frequencies of each term, and int32[N] document lengths. Only the
+    query's terms get columns, so the matrix stays N x (query length).
+    """
+    column = {term: j for j, term in enumerate(terms)}
+    tf = np.zeros((len(documents), len(terms)), dtype=np.float32)
+    dl = np.empty(len(documents), dtype=np.int32)
+    for i, doc in enumerate(documents):
+        tokens = tokenize(doc)
+        dl[i] = len(tokens)
+        for token in tokens:
+            j = column.get(token)
+            if j is not None:
+                tf[i, j] += 1
+    return np.arange(len(documents), dtype=np.int32), tf, dl
+
+
+def compute_idf(tf):
+    """Per-term inverse document frequency over the rows of `tf`."""
+    df = np.count_nonzero(tf, axis=0)
+    return np.log1p((len(tf) - df + 0.5) / (df + 0.5)).astype(np.float32)
+
+
+def _score_numpy(tf, dl, idf, k1, b):
+    """BM25 of each row of `tf`, as one broadcast expression."""
+    avgdl = dl.mean() or 1.0
+    norm = k1 * (1 - b + b * dl / avgdl)
+    return (idf * (tf * (k1 + 1)) / (tf + norm[:, None])).sum(axis=1)
+
+
+def _score_loop(tf, dl, idf, k1, b):
+    """BM25 of each row of `tf`, one document per parallel iteration."""
+    n, t = tf.shape
+    avgdl = dl.sum() / n if n else 1.0
+    if avgdl == 0:
+        avgdl = 1.0
+    out = np.zeros(n, dtype=np.float32)
+    for i in prange(n):
+        norm = k1 * (1 - b + b * dl[i] / avgdl)
+        acc = 0.0
+        for j in range(t):
+            f = tf[i, j]
+            acc += idf[j] * f * (k1 + 1) / (f + norm)
+        out[i] = acc
+    return out
+
+
+score_soa = (
+    njit(parallel=True, fastmath=True, cache=True)(_score_loop) if njit else _score_numpy
+)
+
+
+def max_scores(tf, dl, idf, k1, b):
+    """
+    Upper bound on each term's contribution to any document's score.
+
+    A term scores highest at its largest frequency in the shortest
+    document, so the bound needs only column maxima, not every score.
+    """
+    avgdl = dl.mean() or 1.0
+    tf_max = tf.max(axis=0)
+    norm_min = k1 * (1 - b + b * dl.min() / avgdl)
+    return (idf * (tf_max * (k1 + 1)) / (tf_max + norm_min)).astype(np.float32)
+
+
+def _max_score_loop(tf, dl, idf, bounds, k, k1, b):
+    """
+    MaxScore top-k: ids and scores of the k best documents, unordered.
+
+    Terms are visited in descending bound order; a document is dropped
+    as soon as its partial score plus the remaining terms' bounds can't
+    beat the current k-th best. Only positive scores are kept, and ties
+    go to the earlier document.
+    """
+    n, t = tf.shape
+    avgdl = dl.sum() / n if n else 1.0
+    if avgdl == 0:
+        avgdl = 1.0
+    order = np.argsort(-bounds)
+    remaining = np.zeros(t + 1, dtype=np.float32)
+    for i in range(t - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + bounds[order[i]]
+
+    top_ids = np.full(k, -1, dtype=np.int32)
+    top_scores = np.zeros(k, dtype=np.float32)
+    worst = 0
+    for d in range(n):
+        threshold = top_scores[worst]
+        norm = k1 * (1 - b + b * dl[d] / avgdl)
+        acc = 0.0
+        pruned = False
+        for i in range(t):
+            if acc + remaining[i] <= threshold:
+                pruned = True
+                break
+            j = order[i]
+            f = tf[d, j]
+            if f > 0:
+                acc += idf[j] * f * (k1 + 1) / (f + norm)
+        if not pruned and acc > threshold:
+            top_ids[worst] = d
+            top_scores[worst] = acc
+            worst = np.argmin(top_scores)
+    return top_ids, top_scores
+
+
+_max_score_top_k = njit(fastmath=True, cache=True)(_max_score_loop) if njit else None
+
+
+def _score_python(
+    terms: Sequence[str],
+    documents: Sequence[str],
+    k1: float,
+    b: float,
+) -> list[float]:
+    """BM25 without NumPy, one term at a time."""
+    docs = [Counter(tokenize(doc)) for doc in documents]
+    lengths = [sum(counts.values()) for counts in docs]
+    avgdl = sum(lengths) / len(docs) or 1.0
+    scores = [0.0] * len(docs)
+
+    for term in terms:
+        df = sum(1 for counts in docs if term in counts)
+        if not df:
+            continue
+        term_idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for i, counts in enumerate(docs):
+            tf = counts.get(term)
+            if tf:
+                scores[i] += term_idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[i] / avgdl))
+
+    return scores
+
+
+def score(
+    query: str,
+    documents: Sequence[str],
+    k1: float = 1.5,
+    b: float = 0.75,
+) -> list[float]:
+    """BM25 score of every document against the query, in input order."""
+    if not documents:
+        return []
+
+    terms = list(dict.fromkeys(tokenize(query)))
+    if np is None:
+        return _score_python(terms, documents, k1, b)
+
+    _, tf, dl = build_soa(documents, terms)
+    return score_soa(tf, dl, compute_idf(tf), k1, b).tolist()
+
+
+def top_k(
+    query: str,
+    documents: Sequence[str],
+    k: int,
+    k1: float = 1.5,
+    b: float = 0.75,
+) -> list[tuple[int, float]]:
+    """
+    `(index, score)` of the k best matching documents, best first.
+
+    Only documents with a positive score are returned; equal scores keep
+    input order.
+    """
+    if not documents or k <= 0:
+        return []
+
+    terms = list(dict.fromkeys(tokenize(query)))
+    if _max_score_top_k is None or not terms:
+        scores = score(query, documents, k1, b)
+        best = heapq.nsmallest(k, ((-s, i) for i, s in enumerate(scores) if s > 0))
+        return [(i, -neg) for neg, i in best]
+
+    _, tf, dl = build_soa(documents, terms)
+    term_idf = compute_idf(tf)
+    ids, scores = _max_score_top_k(
+        tf, dl, term_idf, max_scores(tf, dl, term_idf, k1, b), k, k1, b
+    )
+    hits = sorted(
+        (-float(s), int(i)) for i, s in zip(ids, scores) if i >= 0
+    )
+    return [(i, -neg) for neg, i in hits]
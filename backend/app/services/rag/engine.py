@@ -14,14 +14,26 @@ Implements:
 - Citation verification
 """
 
+import asyncio
 import hashlib
+import heapq
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timezone
+from itertools import chain
 from typing import Any
-from uuid import uuid4
+from uuid import NAMESPACE_URL, UUID, uuid5
 
 import httpx
+import orjson
 
-from app.core.config import settings
+from app.core.cache import TTLCache
+from app.core.config import cfg
+from app.services.rag import bm25
+
+# Stands in for a missing or unparseable published date. It is fixed, so
+# such items keep the same feed position (and cursors stay valid) across
+# fetches, and it sorts them after every dated item
+_NO_DATE = datetime(1970, 1, 1, tzinfo=timezone.utc)
 
 
 class RAGIntelligenceEngine:
@@ -61,12 +73,34 @@ class RAGIntelligenceEngine:
         """Initialize the RAG engine."""
         self._http_client = None
         self._vector_client = None
+        
+        # Demo items never change, so they're built (and their ids
+        # derived) once rather than per feed request
+        self._demo_items = tuple(self._get_demo_intelligence_items())
+        
+        # In-flight or finished upstream fetches by query; FDA data
+        # changes on the scale of hours, so a few minutes' reuse is safe
+        self._upstream_cache = TTLCache(maxsize=256, ttl=cfg.upstream_cache_ttl_seconds)
 
     @property
     def http_client(self) -> httpx.AsyncClient:
-        """Lazy HTTP client initialization."""
+        """
+        Lazy HTTP client initialization.
+        
+        One pooled client is shared by every request: keep-alive
+        connections skip repeated TCP/TLS handshakes with OpenFDA and
+        DailyMed, and HTTP/2 multiplexes concurrent calls to one host.
+        """
         if self._http_client is None:
-            self._http_client = httpx.AsyncClient(timeout=30.0)
+            self._http_client = httpx.AsyncClient(
+                timeout=httpx.Timeout(connect=5.0, read=20.0, write=10.0, pool=5.0),
+                limits=httpx.Limits(
+                    max_connections=cfg.http_max_connections,
+                    max_keepalive_connections=cfg.http_max_keepalive_connections,
+                    keepalive_expiry=cfg.http_keepalive_expiry_seconds,
+                ),
+                http2=True,
+            )
         return self._http_client
 
     async def close(self):
@@ -74,28 +108,95 @@ class RAGIntelligenceEngine:
         if self._http_client:
             await self._http_client.aclose()
 
+    async def _cached_fetch(self, key: tuple, fetch: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run an upstream fetch once per key and TTL window.
+        
+        The task itself is cached, so concurrent callers with the same
+        key share one request. Empty results are not kept, since the
+        fetchers also return them on upstream errors.
+        """
+        task = self._upstream_cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._upstream_cache.set(key, task)
+        
+        try:
+            result = await asyncio.shield(task)
+        except Exception:
+            self._upstream_cache.discard(key)
+            raise
+        
+        if not result:
+            self._upstream_cache.discard(key)
+        return result
+
     # =========================================================================
     # FDA DATA RETRIEVAL
     # =========================================================================
 
+    def _search_params(
+        self,
+        text_field: str,
+        query: str | None,
+        drug_name: str | None,
+    ) -> str | None:
+        """
+        Build an OpenFDA `search` expression.
+        
+        Query terms may match the endpoint's text field or the drug's
+        brand/generic name; a drug name, if given, must match as a phrase.
+        Terms are reduced to alphanumerics so user input can't alter the
+        expression syntax.
+        """
+        clauses = []
+        if drug_name:
+            name = " ".join(bm25.tokenize(drug_name))
+            if name:
+                clauses.append(f'(openfda.brand_name:"{name}" OR openfda.generic_name:"{name}")')
+        
+        terms = bm25.tokenize(query) if query else []
+        if terms:
+            clauses.append("(" + " OR ".join(
+                f"{field}:{term}"
+                for term in dict.fromkeys(terms)
+                for field in (text_field, "openfda.brand_name", "openfda.generic_name")
+            ) + ")")
+        
+        return " AND ".join(clauses) or None
+
     async def fetch_fda_recalls(
         self,
         drug_name: str | None = None,
         limit: int = 10,
+        query: str | None = None,
     ) -> list[dict[str, Any]]:
         """
-        Fetch drug recalls from FDA Enforcement API.
+        Fetch drug recalls from FDA Enforcement API (cached).
         """
+        return await self._cached_fetch(
+            ("recalls", drug_name, limit, query),
+            lambda: self._fetch_fda_recalls(drug_name, limit, query),
+        )
+
+    async def _fetch_fda_recalls(
+        self,
+        drug_name: str | None,
+        limit: int,
+        query: str | None,
+    ) -> list[dict[str, Any]]:
+        """Fetch drug recalls from FDA Enforcement API."""
         params = {
             "limit": limit,
             "sort": "report_date:desc",
         }
         
-        if drug_name:
-            params["search"] = f'openfda.brand_name:"{drug_name}" OR openfda.generic_name:"{drug_name}"'
+        search = self._search_params("reason_for_recall", query, drug_name)
+        if search:
+            params["search"] = search
         
-        if settings.fda_api_key:
-            params["api_key"] = settings.fda_api_key
+        if cfg.fda_api_key:
+            params["api_key"] = cfg.fda_api_key
 
         try:
             response = await self.http_client.get(
@@ -107,8 +208,9 @@ class RAGIntelligenceEngine:
             
             results = []
             for item in data.get("results", []):
+                verification_hash = self._generate_verification_hash(item)
                 results.append({
-                    "id": str(uuid4()),
+                    "id": str(UUID(verification_hash)),
                     "type": "recall",
                     "severity": self._classify_recall_severity(item),
                     "title": "FDA Drug Recall Alert",
@@ -119,7 +221,7 @@ class RAGIntelligenceEngine:
                     "source_document_id": item.get("recall_number"),
                     "published_date": self._parse_fda_date(item.get("report_date")),
                     "is_verified": True,
-                    "verification_hash": self._generate_verification_hash(item),
+                    "verification_hash": verification_hash,
                 })
             
             return results
@@ -131,19 +233,33 @@ class RAGIntelligenceEngine:
         self,
         drug_name: str | None = None,
         limit: int = 10,
+        query: str | None = None,
     ) -> list[dict[str, Any]]:
         """
-        Fetch drug safety information from FDA Drug Labels API.
+        Fetch drug safety information from FDA Drug Labels API (cached).
         """
+        return await self._cached_fetch(
+            ("safety_alerts", drug_name, limit, query),
+            lambda: self._fetch_fda_safety_alerts(drug_name, limit, query),
+        )
+
+    async def _fetch_fda_safety_alerts(
+        self,
+        drug_name: str | None,
+        limit: int,
+        query: str | None,
+    ) -> list[dict[str, Any]]:
+        """Fetch drug safety information from FDA Drug Labels API."""
         params = {
             "limit": limit,
         }
         
-        if drug_name:
-            params["search"] = f'openfda.brand_name:"{drug_name}"'
+        search = self._search_params("boxed_warning", query, drug_name)
+        if search:
+            params["search"] = search
         
-        if settings.fda_api_key:
-            params["api_key"] = settings.fda_api_key
+        if cfg.fda_api_key:
+            params["api_key"] = cfg.fda_api_key
 
         try:
             response = await self.http_client.get(
@@ -158,8 +274,9 @@ class RAGIntelligenceEngine:
                 # Check for black box warnings
                 warnings = item.get("boxed_warning", [])
                 if warnings:
+                    verification_hash = self._generate_verification_hash(item)
                     results.append({
-                        "id": str(uuid4()),
+                        "id": str(UUID(verification_hash)),
                         "type": "safety_alert",
                         "severity": "high",
                         "title": "Black Box Warning",
@@ -167,9 +284,9 @@ class RAGIntelligenceEngine:
                         "summary": warnings[0][:500] if warnings else "Black box warning present",
                         "source_name": "FDA Drug Labels",
                         "source_url": self._get_dailymed_url(item),
-                        "published_date": datetime.now(timezone.utc),
+                        "published_date": self._parse_fda_date(item.get("effective_time")),
                         "is_verified": True,
-                        "verification_hash": self._generate_verification_hash(item),
+                        "verification_hash": verification_hash,
                     })
             
             return results
@@ -183,8 +300,15 @@ class RAGIntelligenceEngine:
 
     async def fetch_drug_label(self, drug_name: str) -> dict[str, Any] | None:
         """
-        Fetch structured drug label from DailyMed.
+        Fetch structured drug label from DailyMed (cached).
         """
+        return await self._cached_fetch(
+            ("label", drug_name.lower().strip()),
+            lambda: self._fetch_drug_label(drug_name),
+        )
+
+    async def _fetch_drug_label(self, drug_name: str) -> dict[str, Any] | None:
+        """Fetch structured drug label from DailyMed."""
         try:
             # Search for drug
             search_url = f"{self.DAILYMED_BASE}/spls.json"
@@ -240,10 +364,10 @@ class RAGIntelligenceEngine:
 
     async def get_intelligence_feed(
         self,
-        page: int = 1,
         page_size: int = 20,
         types: list[str] | None = None,
         severity: list[str] | None = None,
+        cursor: tuple[float, datetime, str] | None = None,
     ) -> dict[str, Any]:
         """
         Get aggregated intelligence feed from all sources.
@@ -253,59 +377,53 @@ class RAGIntelligenceEngine:
         - Safety alerts
         - New indications
         - Label updates
+        
+        Pagination is keyset-based: `cursor` is the `feed_position` of the
+        last item already seen, and only items ordered after it are
+        returned. `next_cursor` is None on the last page.
         """
+        # Fetch from FDA; both endpoints are queried concurrently and a
+        # failing source just contributes nothing
+        recalls, safety_alerts = await asyncio.gather(
+            self.fetch_fda_recalls(limit=10),
+            self.fetch_fda_safety_alerts(limit=10),
+            return_exceptions=True,
+        )
+        if isinstance(recalls, Exception):
+            recalls = []
+        if isinstance(safety_alerts, Exception):
+            safety_alerts = []
+        
+        # One pass: deduplicate on summary text with demo data last for
+        # variety (the strings cache their own hashes, so no digest is
+        # needed), then filter by type, severity and the cursor. Keyset
+        # pagination keeps everything strictly after the cursor
         all_items = []
         seen_summaries = set()
+        for item in chain(recalls, safety_alerts, self._demo_items):
+            if item["summary"] in seen_summaries:
+                continue
+            seen_summaries.add(item["summary"])
+            if types and item["type"] not in types:
+                continue
+            if severity and item["severity"] not in severity:
+                continue
+            if cursor is not None and self.feed_position(item) >= cursor:
+                continue
+            all_items.append(item)
         
-        # Fetch from FDA
-        recalls = await self.fetch_fda_recalls(limit=10)
-        for item in recalls:
-            summary_hash = hashlib.md5(item["summary"].encode()).hexdigest()
-            if summary_hash not in seen_summaries:
-                all_items.append(item)
-                seen_summaries.add(summary_hash)
-        
-        safety_alerts = await self.fetch_fda_safety_alerts(limit=10)
-        for item in safety_alerts:
-            summary_hash = hashlib.md5(item["summary"].encode()).hexdigest()
-            if summary_hash not in seen_summaries:
-                all_items.append(item)
-                seen_summaries.add(summary_hash)
-        
-        # Add demo data for variety
-        demo_items = self._get_demo_intelligence_items()
-        for item in demo_items:
-            summary_hash = hashlib.md5(item["summary"].encode()).hexdigest()
-            if summary_hash not in seen_summaries:
-                all_items.append(item)
-                seen_summaries.add(summary_hash)
-        
-        # Filter by type if specified
-        if types:
-            all_items = [item for item in all_items if item["type"] in types]
-        
-        # Filter by severity if specified
-        if severity:
-            all_items = [item for item in all_items if item["severity"] in severity]
-        
-        # Sort by date (most recent first)
-        all_items.sort(key=lambda x: x.get("published_date", datetime.min.replace(tzinfo=timezone.utc)), reverse=True)
-        
-        # Rerank by source priority
-        all_items = self._rerank_by_source(all_items)
-        
-        # Paginate
-        total = len(all_items)
-        start = (page - 1) * page_size
-        end = start + page_size
-        paginated_items = all_items[start:end]
+        # Ordered by source priority, then date (most recent first), id as
+        # tie-breaker so the order is total and cursors are unambiguous.
+        # Only the page and one item past it (for has_more) need ordering
+        page = heapq.nlargest(page_size + 1, all_items, key=self.feed_position)
+        paginated_items = page[:page_size]
+        has_more = len(page) > page_size
         
         return {
             "items": paginated_items,
-            "total": total,
-            "page": page,
             "page_size": page_size,
-            "has_more": end < total,
+            "has_more": has_more,
+            "next_cursor": self.feed_position(paginated_items[-1]) if has_more else None,
         }
 
     async def search_intelligence(
@@ -320,25 +438,46 @@ class RAGIntelligenceEngine:
         Uses hybrid search:
         1. Vector similarity (semantic)
         2. BM25 keyword matching
+        
+        OpenFDA filters on its side, so only matching recalls and alerts
+        are transferred; those and the demo items are then ranked with
+        BM25. `relevance_score` is normalized to the best hit.
         """
         # For MVP, use keyword matching
         # Production would use vector DB (Qdrant)
         
-        feed = await self.get_intelligence_feed(page_size=100)
-        items = feed["items"]
+        recalls, safety_alerts = await asyncio.gather(
+            self.fetch_fda_recalls(drug_name=drug_name, limit=limit, query=query),
+            self.fetch_fda_safety_alerts(drug_name=drug_name, limit=limit, query=query),
+            return_exceptions=True,
+        )
+        if isinstance(recalls, Exception):
+            recalls = []
+        if isinstance(safety_alerts, Exception):
+            safety_alerts = []
         
-        query_lower = query.lower()
-        results = []
+        candidates = [*recalls, *safety_alerts, *self._demo_items]
+        hits = bm25.top_k(
+            query,
+            [f"{item['title']} {item['drug_name']} {item['summary']}" for item in candidates],
+            limit,
+        )
+        ranked = [(score, candidates[i]) for i, score in hits]
         
-        for item in items:
-            # Simple keyword matching
-            text = f"{item['title']} {item['drug_name']} {item['summary']}".lower()
-            if query_lower in text:
-                results.append(item)
-            elif drug_name and drug_name.lower() in item['drug_name'].lower():
-                results.append(item)
+        # Items for the drug that share no terms with the query rank last
+        if drug_name and len(ranked) < limit:
+            drug_lower = drug_name.lower()
+            hit_ids = {i for i, _ in hits}
+            ranked.extend(
+                (0.0, item)
+                for i, item in enumerate(candidates)
+                if i not in hit_ids and drug_lower in item["drug_name"].lower()
+            )
+            ranked = ranked[:limit]
         
-        return results[:limit]
+        # Items are shared with the caches, so score copies of them
+        best = ranked[0][0] if ranked and ranked[0][0] > 0 else 1.0
+        return [{**item, "relevance_score": score / best} for score, item in ranked]
 
     async def verify_source(self, source_id: str, source_name: str) -> dict[str, Any]:
         """
@@ -406,13 +545,13 @@ class RAGIntelligenceEngine:
         return "Unknown Drug"
 
     def _parse_fda_date(self, date_str: str | None) -> datetime:
-        """Parse FDA date format."""
+        """Parse FDA date format; undated items get the fixed `_NO_DATE`."""
         if not date_str:
-            return datetime.now(timezone.utc)
+            return _NO_DATE
         try:
             return datetime.strptime(date_str, "%Y%m%d").replace(tzinfo=timezone.utc)
         except ValueError:
-            return datetime.now(timezone.utc)
+            return _NO_DATE
 
     def _get_dailymed_url(self, item: dict[str, Any]) -> str:
         """Get DailyMed URL for a drug."""
@@ -424,23 +563,21 @@ class RAGIntelligenceEngine:
 
     def _generate_verification_hash(self, item: dict[str, Any]) -> str:
         """Generate verification hash for an item."""
-        import json
-        content = json.dumps(item, sort_keys=True, default=str)
-        return hashlib.sha256(content.encode()).hexdigest()[:32]
-
-    def _rerank_by_source(self, items: list[dict[str, Any]]) -> list[dict[str, Any]]:
-        """Rerank items by source priority."""
-        def get_priority(item):
-            source = item.get("source_name", "")
-            return self.SOURCE_PRIORITY.get(source, 0.5)
-        
-        return sorted(items, key=get_priority, reverse=True)
+        content = orjson.dumps(item, option=orjson.OPT_SORT_KEYS, default=str)
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def feed_position(self, item: dict[str, Any]) -> tuple[float, datetime, str]:
+        """Sort key of an item in the feed, which is ordered by this key descending."""
+        return (
+            self.SOURCE_PRIORITY.get(item.get("source_name", ""), 0.5),
+            item.get("published_date", _NO_DATE),
+            item["id"],
+        )
 
     def _get_demo_intelligence_items(self) -> list[dict[str, Any]]:
         """Get demo intelligence items for MVP."""
-        return [
+        items = [
             {
-                "id": str(uuid4()),
                 "type": "recall",
                 "severity": "high",
                 "title": "FDA Drug Recall Alert",
@@ -453,7 +590,6 @@ class RAGIntelligenceEngine:
                 "verification_hash": "abc123def456",
             },
             {
-                "id": str(uuid4()),
                 "type": "new_indication",
                 "severity": "info",
                 "title": "New Indication Approved",
@@ -466,7 +602,6 @@ class RAGIntelligenceEngine:
                 "verification_hash": "def789ghi012",
             },
             {
-                "id": str(uuid4()),
                 "type": "safety_alert",
                 "severity": "medium",
                 "title": "Safety Communication - Black Box Warning",
@@ -479,7 +614,6 @@ class RAGIntelligenceEngine:
                 "verification_hash": "ghi345jkl678",
             },
             {
-                "id": str(uuid4()),
                 "type": "label_update",
                 "severity": "info",
                 "title": "Clinical Evidence: Breast Cancer Study",
@@ -492,7 +626,6 @@ class RAGIntelligenceEngine:
                 "verification_hash": "jkl901mno234",
             },
             {
-                "id": str(uuid4()),
                 "type": "safety_alert",
                 "severity": "high",
                 "title": "Dear Healthcare Provider Letter",
@@ -505,7 +638,6 @@ class RAGIntelligenceEngine:
                 "verification_hash": "mno567pqr890",
             },
             {
-                "id": str(uuid4()),
                 "type": "recall",
                 "severity": "medium",
                 "title": "FDA Manufacturing Issue Alert",
@@ -518,6 +650,11 @@ class RAGIntelligenceEngine:
                 "verification_hash": "pqr234stu567",
             },
         ]
+        
+        # Stable ids so feed cursors stay valid across requests
+        for item in items:
+            item["id"] = str(uuid5(NAMESPACE_URL, f"{item['source_url']}#{item['verification_hash']}"))
+        return items
 
 
 # Singleton instance
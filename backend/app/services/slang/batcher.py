@@ -0,0 +1,127 @@
+"""
+Paeon AI - LLM Term Micro-Batching
+
+Coalesces concurrent clinical-term lookups into one Gemini call, so K
+cache-missing symptoms cost one round trip instead of K.
+"""
+
+import asyncio
+import logging
+import re
+from collections.abc import Callable
+
+from app.core.batching import AdaptiveBatcher
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# "3. Dyspnea" / "3) Dyspnea" lines in a batched answer
+_NUMBERED_LINE = re.compile(r"^\s*(\d+)\s*[.):]\s*(.*?)\s*$")
+
+
+class ClinicalTermBatcher:
+    """
+    Micro-batcher for the "symptom -> clinical term" LLM prompt.
+
+    Requests arriving within `max_wait_ms` of each other (up to
+    `max_batch_size`) are sent as a single numbered prompt and the
+    numbered answer is split back per caller. Batches are also capped by
+    prompt size, as a rough token budget. If an answer can't be split
+    cleanly, that batch falls back to one call per symptom.
+    """
+
+    # Rough prompt budget for one batched call (~4 chars per token)
+    MAX_PROMPT_CHARS = 4000
+
+    def __init__(
+        self,
+        generate: Callable[[str, int, float], str],
+        max_batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+    ):
+        """
+        Initialize the batcher.
+
+        `generate(prompt, max_output_tokens, temperature)` performs one
+        blocking LLM call and returns the response text.
+        """
+        self._generate = generate
+        self._batcher: AdaptiveBatcher[str, str] = AdaptiveBatcher(
+            self._handle,
+            max_batch_size=max_batch_size or settings.llm_batch_max_size,
+            max_wait_ms=max_wait_ms or settings.llm_batch_max_wait_ms,
+        )
+
+    async def submit(self, normalized_text: str) -> str:
+        """Queue a symptom description and wait for the raw clinical term."""
+        return await self._batcher.submit(normalized_text)
+
+    async def close(self) -> None:
+        """Wait for in-flight batches to finish."""
+        await self._batcher.close()
+
+    @staticmethod
+    def single_prompt(normalized_text: str) -> str:
+        """Prompt for one symptom."""
+        return f'What medical/clinical term describes this patient symptom in just 1-3 words: "{normalized_text}"? Answer with ONLY the clinical term, nothing else.'
+
+    @staticmethod
+    def batch_prompt(texts: list[str]) -> str:
+        """Prompt for several symptoms, answered as a numbered list."""
+        numbered = "\n".join(f'{i}. "{text}"' for i, text in enumerate(texts, 1))
+        return (
+            "For each numbered patient symptom below, give the medical/clinical term "
+            "that describes it in just 1-3 words. Answer with one line per symptom in "
+            "the form '<number>. <clinical term>' and nothing else.\n\n"
+            f"{numbered}"
+        )
+
+    async def _handle(self, texts: list[str]) -> list[str | Exception]:
+        """Split a collected batch by prompt budget and resolve each group."""
+        groups: list[list[str]] = [[]]
+        size = 0
+        for text in texts:
+            if groups[-1] and size + len(text) > self.MAX_PROMPT_CHARS:
+                groups.append([])
+                size = 0
+            groups[-1].append(text)
+            size += len(text)
+
+        results = await asyncio.gather(*(self._resolve_group(group) for group in groups))
+        return [result for group_results in results for result in group_results]
+
+    async def _resolve_group(self, texts: list[str]) -> list[str | Exception]:
+        """Resolve one group with a single call, falling back per item."""
+        loop = asyncio.get_running_loop()
+        if len(texts) > 1:
+            try:
+                response_text = await loop.run_in_executor(
+                    None, self._generate, self.batch_prompt(texts), 500 + 50 * len(texts), 0.3
+                )
+                terms = self._split_answer(response_text, len(texts))
+                if terms is not None:
+                    return terms
+                logger.warning(f"[LLM] Batched answer could not be split for {len(texts)} items")
+            except Exception as e:
+                logger.warning(f"[LLM] Batched call failed: {type(e).__name__}: {e}")
+
+        return await asyncio.gather(
+            *(
+                loop.run_in_executor(None, self._generate, self.single_prompt(text), 500, 0.3)
+                for text in texts
+            ),
+            return_exceptions=True,
+        )
+
+    @staticmethod
+    def _split_answer(response_text: str, expected: int) -> list[str] | None:
+        """Map a numbered answer back to items; None unless every item is answered."""
+        terms: dict[int, str] = {}
+        for line in response_text.splitlines():
+            match = _NUMBERED_LINE.match(line)
+            if match and match.group(2):
+                terms.setdefault(int(match.group(1)), match.group(2))
+
+        if not all(i in terms for i in range(1, expected + 1)):
+            return None
+        return [terms[i] for i in range(1, expected + 1)]
@@ -18,13 +18,15 @@ import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from typing import Any
-from uuid import uuid4
 
 from langdetect import detect, LangDetectException
 
 from app.core.config import settings
+from app.core.ids import uuid4
 from app.services.compliance.pii_stripper import PIIStripper
 from app.services.compliance.safety_validator import SafetyValidator
+from app.services.slang.batcher import ClinicalTermBatcher
+from app.services.slang.mapping_cache import clinical_mapping_cache
 
 logger = logging.getLogger(__name__)
 
@@ -324,6 +326,8 @@ class SlangToClinicalEngine:
         self.pii_stripper = PIIStripper()
         self.safety_validator = SafetyValidator()
         self._llm_client = None
+        # Coalesces concurrent LLM term lookups into shared calls
+        self.term_batcher = ClinicalTermBatcher(self._generate_text)
 
     @property
     def llm_client(self):
@@ -334,6 +338,17 @@ class SlangToClinicalEngine:
             self._llm_client = genai.GenerativeModel(settings.gemini_model)
         return self._llm_client
 
+    def _generate_text(self, prompt: str, max_output_tokens: int, temperature: float) -> str:
+        """Blocking single LLM call; returns the stripped response text."""
+        response = self.llm_client.generate_content(
+            contents=prompt,
+            generation_config={
+                "max_output_tokens": max_output_tokens,
+                "temperature": temperature,
+            }
+        )
+        return (response.text if hasattr(response, 'text') else "").strip()
+
     def detect_language(self, text: str) -> str:
         """
         Detect the language of input text.
@@ -457,36 +472,31 @@ Output (English translation only, no medical terms):"""
         1. Curated mappings (highest priority)
         2. LLM semantic mapping for unknown symptoms
         """
-        import asyncio
-        
         # Try curated mappings first
         curated = self.find_curated_mapping(normalized_text)
         if curated:
-            return {
-                "clinical_interpretation": curated["clinical"],
-                "standard_codes": [
-                    {
-                        "system": "SNOMED-CT",
-                        "code": curated["snomed"],
-                        "display": curated["clinical"]
-                    },
-                    {
-                        "system": "ICD-10",
-                        "code": curated["icd10"],
-                        "display": curated["clinical"]
-                    }
-                ],
-                "confidence": min(0.95, 0.7 + curated["match_score"] * 0.25),
-                "rationale": f"Matched curated mapping for '{curated['matched_expression']}'. "
-                           f"Body system: {curated['body_system']}.",
-                "source": "curated_mapping"
-            }
+            return self._mapping_result(
+                curated,
+                confidence=min(0.95, 0.7 + curated["match_score"] * 0.25),
+                rationale=f"Matched curated mapping for '{curated['matched_expression']}'. ",
+                source="curated_mapping",
+            )
+        
+        # Then clinician-verified mappings stored in the database
+        stored = await clinical_mapping_cache.lookup(normalized_text)
+        if stored:
+            return self._mapping_result(
+                stored,
+                confidence=0.9,
+                rationale="Matched stored clinical mapping. ",
+                source="clinical_mapping",
+            )
 
-        # Use LLM for unknown symptoms - run in thread pool to avoid blocking
+        # Use LLM for unknown symptoms - batched with concurrent requests,
+        # calls run in a thread pool to avoid blocking
         try:
-            loop = asyncio.get_running_loop()
-            result = await loop.run_in_executor(None, self._llm_clinical_mapping, normalized_text)
-            return result
+            response_text = await self.term_batcher.submit(normalized_text)
+            return self._llm_clinical_mapping(normalized_text, response_text)
         except Exception as e:
             logger.error(f"LLM failed for '{normalized_text}': {type(e).__name__}: {str(e)}", exc_info=True)
             # Fallback if LLM fails - return Unspecified with confidence 0.5
@@ -501,6 +511,33 @@ Output (English translation only, no medical terms):"""
                 "source": "fallback"
             }
 
+    def _mapping_result(
+        self,
+        mapping: dict[str, Any],
+        confidence: float,
+        rationale: str,
+        source: str,
+    ) -> dict[str, Any]:
+        """Build a clinical mapping result from a curated or stored mapping."""
+        return {
+            "clinical_interpretation": mapping["clinical"],
+            "standard_codes": [
+                {
+                    "system": "SNOMED-CT",
+                    "code": mapping["snomed"],
+                    "display": mapping["clinical"]
+                },
+                {
+                    "system": "ICD-10",
+                    "code": mapping["icd10"],
+                    "display": mapping["clinical"]
+                }
+            ],
+            "confidence": confidence,
+            "rationale": f"{rationale}Body system: {mapping['body_system']}.",
+            "source": source
+        }
+
     # LLM term to codes mapping - for terms returned by LLM
     LLM_TERM_CODES = {
         "tinnitus": ("Tinnitus", "60862009", "H93.1"),
@@ -553,25 +590,12 @@ Output (English translation only, no medical terms):"""
         "metallic taste": ("Dysgeusia", "367069002", "R43.2"),
     }
 
-    def _llm_clinical_mapping(self, normalized_text: str) -> dict[str, Any]:
+    def _llm_clinical_mapping(self, normalized_text: str, response_text: str) -> dict[str, Any]:
         """
-        Use LLM to map text to clinical terminology.
-        Ask for plain text response, not JSON.
+        Map the LLM's plain-text clinical term to terminology codes.
+        The term itself comes from `term_batcher`.
         """
         try:
-            # Ask for just the clinical term in plain English
-            prompt = f'What medical/clinical term describes this patient symptom in just 1-3 words: "{normalized_text}"? Answer with ONLY the clinical term, nothing else.'
-            
-            # Call Gemini with high tokens and low temperature
-            response = self.llm_client.generate_content(
-                contents=prompt,
-                generation_config={
-                    "max_output_tokens": 500,  # Much higher
-                    "temperature": 0.3,  # Slightly creative
-                }
-            )
-            
-            response_text = (response.text if hasattr(response, 'text') else "").strip()
             logger.info(f"[LLM] Plain text response: {repr(response_text)}")
             
             if not response_text or len(response_text) < 2:
@@ -633,7 +657,7 @@ Output (English translation only, no medical terms):"""
         start_time = time.time()
         
         # Step 1: Strip PII
-        stripped_text, pii_report = self.pii_stripper.strip_pii(text)
+        stripped_text, pii_report = await self.pii_stripper.astrip_pii(text)
         
         # Step 2: Detect language
         detected_language = self.detect_language(stripped_text)
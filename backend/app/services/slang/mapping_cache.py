@@ -0,0 +1,150 @@
+"""
+Paeon AI - Clinical Mapping Cache
+
+Redis read-through cache for stored clinical mappings. A RedisBloom
+filter of every known expression lets lookups for unknown expressions
+skip the database entirely.
+"""
+
+import hashlib
+import logging
+from typing import Any
+
+import orjson
+from redis.exceptions import RedisError, ResponseError
+from sqlalchemy import select
+
+from app.core.cache import get_bytes, get_redis, set_bytes
+from app.core.config import settings
+from app.db.models import ClinicalMapping
+from app.db.session import async_session_maker
+
+logger = logging.getLogger(__name__)
+
+
+class ClinicalMappingCache:
+    """
+    Cached lookup of `clinical_mappings` by colloquial expression.
+
+    Lookup order:
+    1. Redis entry for the expression
+    2. Bloom filter membership (definite miss -> no DB query)
+    3. Database, with the result written back to Redis
+
+    Only verified mappings with both SNOMED and ICD-10 codes are served.
+    The app never writes `clinical_mappings`; the filter is built by
+    `warm` at startup, so rows curated later are found after a restart.
+    If RedisBloom is not loaded on the server no stored mappings are
+    looked up at all, rather than adding a database round trip to every
+    uncurated translation.
+    """
+
+    KEY_PREFIX = "cm:"
+    BLOOM_KEY = "cm:bloom"
+    BLOOM_ERROR_RATE = 0.001
+    BLOOM_CAPACITY = 100_000
+
+    def __init__(self):
+        """Initialize the cache; `warm` loads the bloom filter."""
+        self._bloom_ready = False
+
+    @staticmethod
+    def _servable():
+        """WHERE clause for mappings that may be served."""
+        return (
+            ClinicalMapping.is_verified.is_(True),
+            ClinicalMapping.snomed_code.is_not(None),
+            ClinicalMapping.icd10_code.is_not(None),
+        )
+
+    def _key(self, expression: str) -> str:
+        """Redis key for an expression."""
+        digest = hashlib.blake2b(expression.encode(), digest_size=16).hexdigest()
+        return f"{self.KEY_PREFIX}{digest}"
+
+    async def warm(self) -> None:
+        """Populate the bloom filter with every stored expression."""
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    select(ClinicalMapping.colloquial_expression).where(*self._servable())
+                )
+                expressions = [expr.lower() for expr in result.scalars()]
+        except Exception:
+            logger.warning("Clinical mapping cache warm-up skipped: database unavailable")
+            return
+
+        redis = get_redis()
+        try:
+            try:
+                await redis.execute_command(
+                    "BF.RESERVE", self.BLOOM_KEY, self.BLOOM_ERROR_RATE, self.BLOOM_CAPACITY
+                )
+            except ResponseError as e:
+                # Filter already exists from a previous start
+                if "exists" not in str(e).lower():
+                    raise
+            if expressions:
+                await redis.execute_command("BF.MADD", self.BLOOM_KEY, *expressions)
+            self._bloom_ready = True
+        except RedisError:
+            logger.warning("RedisBloom unavailable; clinical mapping misses will query the database")
+
+    async def _may_exist(self, expression: str) -> bool:
+        """Bloom membership check; True when the filter can't be consulted."""
+        try:
+            return bool(await get_redis().execute_command("BF.EXISTS", self.BLOOM_KEY, expression))
+        except RedisError:
+            return True
+
+    async def lookup(self, expression: str) -> dict[str, Any] | None:
+        """
+        Find a stored mapping for an exact expression. Expressions are
+        stored lowercase, like the engine's curated mapping keys.
+
+        Returns a dict shaped like the engine's curated mappings, or None.
+        """
+        if not self._bloom_ready:
+            return None
+
+        expression = expression.lower()
+        key = self._key(expression)
+
+        cached = await get_bytes(key)
+        if cached is not None:
+            return orjson.loads(cached)
+
+        if not await self._may_exist(expression):
+            return None
+
+        try:
+            async with async_session_maker() as session:
+                result = await session.execute(
+                    select(
+                        ClinicalMapping.clinical_term,
+                        ClinicalMapping.snomed_code,
+                        ClinicalMapping.icd10_code,
+                        ClinicalMapping.body_system,
+                    )
+                    .where(ClinicalMapping.colloquial_expression == expression, *self._servable())
+                    .limit(1)
+                )
+                row = result.first()
+        except Exception:
+            return None
+
+        if row is None:
+            return None
+
+        mapping = {
+            "clinical": row.clinical_term,
+            "snomed": row.snomed_code,
+            "icd10": row.icd10_code,
+            "body_system": row.body_system or "general",
+        }
+        await set_bytes(key, orjson.dumps(mapping), settings.clinical_mapping_cache_ttl_seconds)
+        return mapping
+
+
+# Singleton instance
+clinical_mapping_cache = ClinicalMappingCache()
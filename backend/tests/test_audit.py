@@ -0,0 +1,67 @@
+"""
+Paeon AI Backend - Audit Service Tests
+"""
+
+from typing import Any
+
+import pytest
+
+from app.services.compliance.audit import _AUDIT_INSERT, audit_service
+from app.services.compliance.audit_bulk import AUDIT_COLUMNS
+
+
+class RecordingSession:
+    """Stands in for an AsyncSession; records executed statements."""
+
+    def __init__(self):
+        self.calls: list[tuple[Any, Any]] = []
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+
+
+@pytest.mark.asyncio
+async def test_flush_buffer_writes_mixed_rows_with_one_column_set():
+    """Rows from different log_* helpers share one executemany."""
+    token = audit_service.start_buffer()
+    translation = audit_service.log_translation(
+        user_id="user-1",
+        input_text="sugar",
+        output_text="diabetes mellitus",
+        confidence=0.9,
+        pii_detected=False,
+        pii_stripped=False,
+        safety_flags=[],
+        ip_address="203.0.113.7",
+        user_agent="pytest",
+    )
+    export = audit_service.log_export(
+        user_id="user-1",
+        asset_id="asset-1",
+        export_format="pdf",
+    )
+    db = RecordingSession()
+
+    written = await audit_service.flush_buffer(token, db=db)
+
+    assert written == 2
+    assert len(db.calls) == 1
+    statement, rows = db.calls[0]
+    assert statement is _AUDIT_INSERT
+    assert [set(row) for row in rows] == [set(AUDIT_COLUMNS)] * 2
+
+    translation_row, export_row = rows
+    assert translation_row["ip_address_hash"] == translation["ip_address_hash"]
+    assert export_row["action_type"] == export["action_type"] == "asset_export_pdf"
+    assert export_row["input_hash"] is None
+    assert export_row["confidence_score"] is None
+    assert export_row["ip_address_hash"] is None
+
+
+@pytest.mark.asyncio
+async def test_flush_buffer_ends_the_buffer():
+    """After a flush, log_* rows are no longer buffered."""
+    token = audit_service.start_buffer()
+    await audit_service.flush_buffer(token, db=RecordingSession())
+
+    assert audit_service.log_buffer.get() is None
@@ -0,0 +1,59 @@
+"""
+Paeon AI Backend - BM25 Scoring Tests
+"""
+
+import pytest
+
+from app.services.rag.bm25 import score, top_k
+
+DOCUMENTS = [
+    "Metformin lowers blood sugar in type 2 diabetes",
+    "Insulin is used when blood sugar stays high",
+    "Aspirin thins the blood and eases pain",
+    "Metformin and insulin together for diabetes with high sugar",
+    "Ibuprofen eases pain and swelling",
+    "Blood pressure medicines include amlodipine",
+    "Sugar free syrups for children",
+    "Metformin metformin metformin",
+]
+
+
+def plain_top_k(query: str, documents: list[str], k: int) -> list[tuple[int, float]]:
+    """Reference top-k: every score, sorted best first, ties in input order."""
+    ranked = sorted(
+        ((i, s) for i, s in enumerate(score(query, documents)) if s > 0),
+        key=lambda hit: -hit[1],
+    )
+    return ranked[:k]
+
+
+@pytest.mark.parametrize("query", [
+    "metformin",
+    "blood sugar",
+    "high blood sugar diabetes insulin",
+    "pain",
+    "metformin metformin",
+    "warfarin",
+    "",
+])
+@pytest.mark.parametrize("k", [1, 3, len(DOCUMENTS), 20])
+def test_top_k_matches_plain_sort(query, k):
+    """top_k agrees with sorting the full score list."""
+    hits = top_k(query, DOCUMENTS, k)
+    expected = plain_top_k(query, DOCUMENTS, k)
+
+    assert [i for i, _ in hits] == [i for i, _ in expected]
+    assert [s for _, s in hits] == pytest.approx([s for _, s in expected], rel=1e-5)
+
+
+def test_top_k_keeps_input_order_on_ties():
+    """Identical documents come back in the order they were given."""
+    documents = ["aspirin", "ibuprofen", "aspirin", "aspirin"]
+
+    assert [i for i, _ in top_k("aspirin", documents, 2)] == [0, 2]
+
+
+@pytest.mark.parametrize("documents, k", [([], 3), (DOCUMENTS, 0), (DOCUMENTS, -1)])
+def test_top_k_empty(documents, k):
+    """No documents or no slots means no hits."""
+    assert top_k("metformin", documents, k) == []
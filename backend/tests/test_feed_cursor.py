@@ -0,0 +1,37 @@
+"""
+Paeon AI Backend - Feed Cursor Tests
+"""
+
+import base64
+from datetime import datetime, timezone
+
+import orjson
+import pytest
+from fastapi import HTTPException
+
+from app.api.rag import _decode_cursor, _encode_cursor
+
+
+def test_cursor_round_trip():
+    position = (0.75, datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc), "item-1")
+
+    assert _decode_cursor(_encode_cursor(position)) == position
+
+
+def _raw_cursor(value) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(value)).decode()
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    _raw_cursor([1.0, "2024-03-01T12:30:00+00:00"]),
+    _raw_cursor(["high", "2024-03-01T12:30:00+00:00", "item-1"]),
+    _raw_cursor([1.0, "yesterday", "item-1"]),
+    _raw_cursor([1.0, "2024-03-01T12:30:00", "item-1"]),  # naive timestamp
+])
+def test_decode_cursor_rejects_malformed(cursor):
+    with pytest.raises(HTTPException) as exc:
+        _decode_cursor(cursor)
+
+    assert exc.value.status_code == 400
@@ -0,0 +1,74 @@
+"""
+Paeon AI Backend - PII Stripper Tests
+"""
+
+import pytest
+
+from app.services.compliance.pii_stripper import PIIStripper, _is_aadhaar, _is_card_number
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("234123412346", True),
+    ("2341 2341 2346", True),
+    ("4987-6543-2102", True),
+    ("234123412345", False),   # wrong check digit
+    ("2341 2341 2364", False),  # transposed digits
+    ("123412341234", False),   # starts with 1
+    ("012345678901", False),   # starts with 0
+])
+def test_is_aadhaar(text, expected):
+    assert _is_aadhaar(text) is expected
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("4111111111111111", True),
+    ("4111 1111 1111 1111", True),
+    ("5500-0000-0000-0004", True),
+    ("4111111111111112", False),
+    ("4111 1111 1111 1121", False),
+])
+def test_is_card_number(text, expected):
+    assert _is_card_number(text) is expected
+
+
+@pytest.fixture
+def stripper():
+    return PIIStripper(region="auto")
+
+
+@pytest.mark.parametrize("text, sanitized, types", [
+    ("I feel dizzy after meals", "I feel dizzy after meals", []),
+    ("write to john@example.com", "write to [EMAIL_REDACTED]", ["email"]),
+    ("Aadhaar 2341 2341 2346", "Aadhaar [AADHAAR_REDACTED]", ["aadhaar"]),
+    ("Aadhaar 2341 2341 2345", "Aadhaar [ID_REDACTED]", ["id_number"]),
+    ("card 4111 1111 1111 1111", "card [CARD_REDACTED]", ["credit_card"]),
+    ("card 4111 1111 1111 1112", "card [ID_REDACTED]", ["id_number"]),
+    ("MRN: 123456 seen", "[MRN_REDACTED] seen", ["mrn"]),
+    ("DOB 12/05/1980", "[DOB_REDACTED]", ["dob"]),
+    ("server 192.168.1.20", "server [IP_REDACTED]", ["ip_address"]),
+    ("seen by Dr. Sharma.", "seen by [NAME_REDACTED].", ["name"]),
+    (
+        "mail a@b.org, card 4111 1111 1111 1111",
+        "mail [EMAIL_REDACTED], card [CARD_REDACTED]",
+        ["email", "credit_card"],
+    ),
+])
+def test_strip_pii(stripper, text, sanitized, types):
+    result, report = stripper.strip_pii(text)
+
+    assert result == sanitized
+    assert report["pii_detected"] is bool(types)
+    assert report["pii_types"] == types
+    assert report["pii_count"] == len(types)
+    assert report["original_length"] == len(text)
+    assert report["stripped_length"] == len(sanitized)
+
+
+def test_strip_pii_cached_report_is_a_copy(stripper):
+    """Mutating a returned report doesn't change later results."""
+    _, first = stripper.strip_pii("write to john@example.com")
+    first["pii_types"].append("tampered")
+
+    _, second = stripper.strip_pii("write to john@example.com")
+
+    assert second["pii_types"] == ["email"]
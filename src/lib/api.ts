@@ -104,10 +104,9 @@ export interface IntelFeedItem {
 
 export interface IntelligenceFeedResponse {
   items: IntelFeedItem[];
-  total: number;
-  page: number;
   page_size: number;
   has_more: boolean;
+  next_cursor: string | null;
 }
 
 export interface SearchRequest {
@@ -260,7 +259,7 @@ export const ragApi = {
    * Get intelligence feed
    */
   async getFeed(params?: {
-    page?: number;
+    cursor?: string;
     page_size?: number;
     types?: string[];
     severity?: string[];
@@ -98,7 +98,7 @@ interface IntelligenceState {
   feedItems: IntelFeedItem[];
   isLoading: boolean;
   error: string | null;
-  page: number;
+  cursor: string | null;
   hasMore: boolean;
   selectedItem: IntelFeedItem | null;
   filters: {
@@ -121,7 +121,7 @@ export const useIntelligenceStore = create<IntelligenceState>((set, get) => ({
   feedItems: [],
   isLoading: false,
   error: null,
-  page: 1,
+  cursor: null,
   hasMore: true,
   selectedItem: null,
   filters: {
@@ -138,12 +138,12 @@ export const useIntelligenceStore = create<IntelligenceState>((set, get) => ({
     set({ isLoading: true, error: null });
     
     if (reset) {
-      set({ page: 1, feedItems: [] });
+      set({ cursor: null, feedItems: [] });
     }
 
     try {
       const result = await ragApi.getFeed({
-        page: reset ? 1 : get().page,
+        cursor: reset ? undefined : get().cursor ?? undefined,
         page_size: 20,
         types: filters.types.length > 0 ? filters.types : undefined,
         severity: filters.severity.length > 0 ? filters.severity : undefined,
@@ -152,6 +152,7 @@ export const useIntelligenceStore = create<IntelligenceState>((set, get) => ({
       set((state) => ({
         feedItems: reset ? result.items : [...state.feedItems, ...result.items],
         hasMore: result.has_more,
+        cursor: result.next_cursor,
         isLoading: false,
       }));
     } catch (error: any) {
@@ -160,10 +161,9 @@ export const useIntelligenceStore = create<IntelligenceState>((set, get) => ({
   },
 
   loadMore: async () => {
-    const { hasMore, page, isLoading } = get();
+    const { hasMore, isLoading } = get();
     if (!hasMore || isLoading) return;
 
-    set({ page: page + 1 });
     await get().fetchFeed();
   },
 